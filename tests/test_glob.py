@@ -9,6 +9,7 @@ made difference in implementation.
 3. We escape with backslashes not `[]`.
 4. A Window's path separator will be two backslashes in a pattern due to escape logic, not one.
 """
+import concurrent.futures
 import contextlib
 from wcmatch import glob
 from wcmatch import pathlib
@@ -20,7 +21,9 @@ import pytest
 import os
 import shutil
 import sys
+import time
 import unittest
+from unittest import mock
 import warnings
 import getpass
 
@@ -968,6 +971,208 @@ class TestPathlibNorm(unittest.TestCase):
         self.assertEqual(glob.Glob('.')._pathlib_norm('.\\test'), 'test')
 
 
+class TestUnique(unittest.TestCase):
+    """Test unique result tracking."""
+
+    def test_disjoint(self):
+        """Test patterns that are proven to yield disjoint results."""
+
+        self.assertTrue(glob.Glob(['docs/**/*.md', 'wcmatch/*.py'], flags=glob.G).nounique)
+        self.assertTrue(glob.Glob(['docs/src/*', 'docs/theme/*', 'README.md']).nounique)
+        self.assertTrue(glob.Glob(['**/*.md'], flags=glob.G).nounique)
+
+    def test_not_disjoint(self):
+        """Test patterns that may yield the same results."""
+
+        self.assertFalse(glob.Glob(['**/*.md', 'docs/*.md'], flags=glob.G).nounique)
+        self.assertFalse(glob.Glob(['docs/src/*', 'docs/*/markdown']).nounique)
+        self.assertFalse(glob.Glob(['docs/*', 'DOCS/*'], flags=glob.I).nounique)
+        self.assertFalse(glob.Glob(['./docs/*', 'docs/*']).nounique)
+        self.assertFalse(glob.Glob(['**/*/**'], flags=glob.G).nounique)
+
+    def test_unique_by_directory(self):
+        """Test that unique results are tracked per directory."""
+
+        gl = glob.Glob(['*', '*/*'])
+        self.assertTrue(gl.is_unique(os.path.join('a', 'b')))
+        self.assertTrue(gl.is_unique(os.path.join('a', 'c')))
+        self.assertTrue(gl.is_unique(os.path.join('a', '')))
+        self.assertTrue(gl.is_unique('a'))
+        self.assertFalse(gl.is_unique(os.path.join('a', 'b')))
+        self.assertFalse(gl.is_unique(os.path.join('a', '')))
+        self.assertFalse(gl.is_unique('a'))
+        self.assertEqual(len(gl.seen), 2)
+
+    def test_unique_results(self):
+        """Test that overlapping patterns return unique results."""
+
+        results = glob.glob(['docs/**/*.md', 'docs/src/markdown/*.md'], flags=glob.G)
+        self.assertTrue(results)
+        self.assertEqual(len(results), len(set(results)))
+
+    @unittest.skipUnless(util.is_case_sensitive(), "Requires a case sensitive file system")
+    def test_unique_ignorecase(self):
+        """Test that paths differing only in case are distinct results on a case sensitive file system."""
+
+        tempdir = TESTFN + "_dir"
+        os.makedirs(os.path.join(tempdir, 'a'))
+        os.makedirs(os.path.join(tempdir, 'A'))
+        self.addCleanup(shutil.rmtree, tempdir)
+        create_empty_file(os.path.join(tempdir, 'a', 'x.txt'))
+
+        for sort in (False, True):
+            self.assertEqual(
+                sorted(glob.glob(['a', 'a/x.txt'], flags=glob.I, root_dir=tempdir, sort=sort)),
+                ['A', 'a', os.path.join('a', 'x.txt')]
+            )
+            self.assertEqual(
+                sorted(glob.glob(['*', '*/'], flags=glob.I, root_dir=tempdir, sort=sort)),
+                ['A', os.path.join('A', ''), 'a', os.path.join('a', '')]
+            )
+
+
+class TestListingMemo(unittest.TestCase):
+    """Test memoization of directory listings within a run."""
+
+    def test_listing_memo(self):
+        """Test that a directory is only scanned once when multiple patterns visit it."""
+
+        patterns = ['docs/src/markdown/*.md', 'docs/src/markdown/*/*.md', 'docs/**/*.md']
+        expected = sorted(set(r for p in patterns for r in glob.glob(p, flags=glob.G)))
+        scanned = []
+        scandir = os.scandir
+
+        def counted(path):
+            """Count scanned directories."""
+
+            scanned.append(path)
+            return scandir(path)
+
+        with mock.patch('os.scandir', counted):
+            self.assertEqual(sorted(glob.glob(patterns, flags=glob.G)), expected)
+        self.assertEqual(len(scanned), len(set(scanned)))
+
+    def test_listing_memo_limit(self):
+        """Test that directories are rescanned when over the memo limit."""
+
+        patterns = ['docs/src/markdown/*.md', 'docs/src/*/*.md']
+        expected = sorted(glob.glob(patterns))
+        with mock.patch('wcmatch.glob._LISTING_LIMIT', 0):
+            self.assertEqual(sorted(glob.glob(patterns)), expected)
+
+    def test_listing_memo_released(self):
+        """Test that listings are not retained after a run."""
+
+        gl = glob.Glob(['docs/*', 'docs/*/*'])
+        self.assertTrue(gl.glob())
+        self.assertIsNone(gl._listings)
+
+
+class TestDirCache(unittest.TestCase):
+    """Test caching directory listings across calls."""
+
+    def setUp(self):
+        """Setup."""
+
+        self.tempdir = TESTFN + "_dir"
+        os.makedirs(os.path.join(self.tempdir, 'a'))
+        self.addCleanup(shutil.rmtree, self.tempdir)
+        create_empty_file(os.path.join(self.tempdir, 'a', 'b.txt'))
+        create_empty_file(os.path.join(self.tempdir, 'c.txt'))
+        self.now = time.time()
+        self.backdate(100)
+
+    def backdate(self, seconds):
+        """Backdate the directories so their listings are not too recent to cache."""
+
+        mtime = self.now - seconds
+        for path in (os.path.join(self.tempdir, 'a'), self.tempdir):
+            os.utime(path, (mtime, mtime))
+
+    def glob(self, cache):
+        """Glob the temporary directory and count the directories scanned."""
+
+        scanned = []
+        scandir = os.scandir
+
+        def counted(path):
+            """Count scanned directories."""
+
+            scanned.append(path)
+            return scandir(path)
+
+        with mock.patch('os.scandir', counted):
+            results = sorted(glob.glob('**/*.txt', flags=glob.G, root_dir=self.tempdir, cache=cache))
+        return results, len(scanned)
+
+    def test_cache(self):
+        """Test that a stable tree is only scanned once."""
+
+        cache = glob.DirCache()
+        expected = sorted([os.path.join('a', 'b.txt'), 'c.txt'])
+        self.assertEqual(self.glob(cache), (expected, 2))
+        self.assertEqual(self.glob(cache), (expected, 0))
+        self.assertEqual(len(cache), 2)
+
+    def test_cache_literal(self):
+        """Test a pattern that starts with a literal directory."""
+
+        cache = glob.DirCache()
+        for _ in range(2):
+            self.assertEqual(glob.glob('a/*.txt', root_dir=self.tempdir, cache=cache), [os.path.join('a', 'b.txt')])
+
+    def test_cache_invalidate(self):
+        """Test that changed directories are rescanned."""
+
+        cache = glob.DirCache()
+        self.glob(cache)
+        create_empty_file(os.path.join(self.tempdir, 'a', 'd.txt'))
+        self.backdate(50)
+        expected = sorted([os.path.join('a', 'b.txt'), os.path.join('a', 'd.txt'), 'c.txt'])
+        self.assertEqual(self.glob(cache), (expected, 2))
+
+    def test_cache_recent(self):
+        """Test that directories modified too recently are not cached."""
+
+        cache = glob.DirCache()
+        create_empty_file(os.path.join(self.tempdir, 'a', 'd.txt'))
+        self.glob(cache)
+        self.assertEqual(len(cache), 1)
+
+    def test_cache_evict(self):
+        """Test that the least recently used listings are evicted."""
+
+        cache = glob.DirCache(max_entries=2)
+        self.glob(cache)
+        self.assertEqual(len(cache), 1)
+        self.assertEqual(cache._size, 1)
+        cache.clear()
+        self.assertEqual(len(cache), 0)
+
+    def test_cache_bad_limit(self):
+        """Test bad cache limit."""
+
+        with pytest.raises(ValueError):
+            glob.DirCache(max_entries=-1)
+
+    @unittest.skipUnless(can_symlink(), "Requires symlinks")
+    def test_cache_symlink(self):
+        """Test that symlinks are resolved even when the listing is cached."""
+
+        os.symlink('a', os.path.join(self.tempdir, 'link'))
+        self.backdate(100)
+        cache = glob.DirCache()
+        flags = glob.G | glob.FOLLOW
+        results = glob.glob('**/*.txt', flags=flags, root_dir=self.tempdir, cache=cache)
+        self.assertIn(os.path.join('link', 'b.txt'), results)
+        # Retarget the link, but restore the modification time so the cached listing is still considered valid.
+        os.remove(os.path.join(self.tempdir, 'link'))
+        os.symlink('c.txt', os.path.join(self.tempdir, 'link'))
+        self.backdate(100)
+        self.assertEqual(len(cache), 2)
+        self.assertEqual(glob.glob('*/', root_dir=self.tempdir, cache=cache), [os.path.join('a', '')])
+
+
 class TestHidden(_TestGlob):
     """Test hidden specific cases."""
 
@@ -1136,6 +1341,15 @@ class TestCWD(_TestGlob):
 
         self.assert_equal(glob.glob('EF', root_dir=pathlib.Path(self.tempdir)), ['EF'])
 
+    def test_cwd_literal_then_magic(self):
+        """Test that a pattern starting with a literal part does not change where the following patterns start."""
+
+        for literal in ('EF', 'a/bcd/EF', 'a/bcd/'):
+            self.assert_equal(
+                sorted(glob.glob([literal, '*F'], root_dir=self.tempdir)),
+                sorted(set(glob.glob(literal, root_dir=self.tempdir) + glob.glob('*F', root_dir=self.tempdir)))
+            )
+
     @pytest.mark.skipif(not glob.SUPPORT_DIR_FD, reason="dir_fd is not supported on this system")
     def test_cwd_fd_dir(self):
         """Test file descriptor."""
@@ -1191,6 +1405,52 @@ class TestCWD(_TestGlob):
         self.assert_equal(glob.glob('bcd/EF', dir_fd=dir_fd, root_dir=root_dir), [os.path.join('bcd', 'EF')])
         os.close(dir_fd)
 
+    @pytest.mark.skipif(not glob.SUPPORT_DIR_FD, reason="dir_fd is not supported on this system")
+    def test_cwd_dir_fd_deep(self):
+        """Test that a deep crawl with a file descriptor matches a normal crawl and releases its descriptors."""
+
+        dir_fd = os.open(self.tempdir, os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            for pattern, root_dir in (('**', None), ('a/**/*', None), ('**/EF', 'a')):
+                expected = sorted(glob.glob(pattern, flags=glob.G, root_dir=self.norm(root_dir or '')))
+                g = glob.Glob([pattern], glob.G, root_dir, dir_fd)
+                self.assert_equal(sorted(g.glob()), expected)
+                self.assert_equal(g._dir_fds, {})
+        finally:
+            os.close(dir_fd)
+
+    @pytest.mark.skipif(not glob.SUPPORT_DIR_FD, reason="dir_fd is not supported on this system")
+    def test_cwd_dir_fd_entries(self):
+        """Test that directory entries are not used after the descriptor they were scanned with is closed."""
+
+        dir_fd = os.open(self.tempdir, os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            # Multiple patterns reuse memoized listings, and the root is scanned with the descriptor held for the run.
+            for patterns in (['*'], ['**', 'a/**'], ['*', '*/*', 'a/*/*']):
+                expected = sorted(glob.glob(patterns, flags=glob.G, root_dir=self.tempdir, types='file', min_size=0))
+                g = glob.Glob(patterns, glob.G, None, dir_fd, types='file', min_size=0)
+                self.assert_equal(sorted(g.glob()), expected)
+                self.assert_equal(g._dir_fds, {})
+        finally:
+            os.close(dir_fd)
+
+    @pytest.mark.skipif(not glob.SUPPORT_DIR_FD, reason="dir_fd is not supported on this system")
+    def test_cwd_dir_fd_follow(self):
+        """Test that a deep crawl following symlinks with a file descriptor matches a normal crawl."""
+
+        dir_fd = os.open(self.tempdir, os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            for flags in (glob.G | glob.L, glob.G | glob.L | glob.D):
+                for options in ({}, {'follow_once': True}, {'order': 'bfs'}):
+                    expected = sorted(glob.glob('**', flags=flags, root_dir=self.tempdir, **options))
+                    self.assert_equal(sorted(glob.glob('**', flags=flags, dir_fd=dir_fd, **options)), expected)
+                    self.assert_equal(
+                        sorted(glob.glob('**', flags=flags, root_dir='a', dir_fd=dir_fd, **options)),
+                        sorted(glob.glob('**', flags=flags, root_dir=self.norm('a'), **options))
+                    )
+        finally:
+            os.close(dir_fd)
+
     @pytest.mark.skipif(not glob.SUPPORT_DIR_FD, reason="dir_fd is not supported on this system")
     def test_cwd_dir_fd_root_dir_globmatch_no_follow(self):
         """Test file descriptor and root directory on `globmatch`, but cover link logic."""
@@ -1225,6 +1485,708 @@ class TestCase(_TestGlob):
             assert len(glob.glob('*', root_dir=self.tempdir)) == 2
 
 
+class TestStatPredicates(_TestGlob):
+    """Test file type, size, and time predicates."""
+
+    @classmethod
+    def setup_fs(cls):
+        """Setup file system."""
+
+        cls.mktemp('a', 'small.log')
+        cls.mktemp('a', 'b', 'big.log')
+        cls.mktemp('old.log')
+        with open(cls.norm('a', 'small.log'), 'w') as f:
+            f.write('x' * 10)
+        with open(cls.norm('a', 'b', 'big.log'), 'w') as f:
+            f.write('x' * 1000)
+        os.utime(cls.norm('old.log'), (1000000000, 1000000000))
+        cls.can_symlink = can_symlink()
+        if cls.can_symlink:
+            os.symlink(os.path.join('a', 'b'), cls.norm('sym'))
+
+    def test_types(self):
+        """Test filtering by file type."""
+
+        self.assert_equal(
+            sorted(glob.glob('**', flags=glob.G, root_dir=self.tempdir, types='file')),
+            sorted(['old.log', os.path.join('a', 'small.log'), os.path.join('a', 'b', 'big.log')])
+        )
+        self.assert_equal(
+            sorted(glob.glob('*', root_dir=self.tempdir, types='dir')),
+            ['a', 'sym'] if self.can_symlink else ['a']
+        )
+        if self.can_symlink:
+            self.assert_equal(glob.glob('*', root_dir=self.tempdir, types=['symlink']), ['sym'])
+
+    def test_types_literal(self):
+        """Test filtering literal and special paths by file type."""
+
+        self.assert_equal(glob.glob('old.log', root_dir=self.tempdir, types='dir'), [])
+        self.assert_equal(glob.glob('old.log', root_dir=self.tempdir, types='file'), ['old.log'])
+        self.assert_equal(glob.glob('a/..', root_dir=self.tempdir, types='dir'), [os.path.join('a', '..')])
+
+    def test_types_globstar_end(self):
+        """Test that the directory a trailing `**` starts from is filtered too."""
+
+        self.assert_equal(
+            sorted(glob.glob('a/**', flags=glob.G, root_dir=self.tempdir, types={'file'})),
+            sorted([os.path.join('a', 'small.log'), os.path.join('a', 'b', 'big.log')])
+        )
+        self.assert_equal(
+            sorted(glob.glob('a/**', flags=glob.G, root_dir=self.tempdir, types={'dir'})),
+            sorted([os.path.join('a', ''), os.path.join('a', 'b')])
+        )
+        self.assert_equal(
+            glob.glob('a/**', flags=glob.G, root_dir=self.tempdir, min_size=1, max_size=100),
+            [os.path.join('a', 'small.log')]
+        )
+        if glob.SUPPORT_DIR_FD:
+            dir_fd = os.open(self.tempdir, os.O_RDONLY | os.O_DIRECTORY)
+            try:
+                self.assert_equal(
+                    sorted(glob.glob('a/**', flags=glob.G, dir_fd=dir_fd, types={'file'})),
+                    sorted([os.path.join('a', 'small.log'), os.path.join('a', 'b', 'big.log')])
+                )
+            finally:
+                os.close(dir_fd)
+
+    def test_bad_type(self):
+        """Test unknown file type."""
+
+        with pytest.raises(ValueError):
+            glob.glob('*', root_dir=self.tempdir, types='device')
+
+    def test_size(self):
+        """Test filtering by size."""
+
+        self.assert_equal(
+            glob.glob('**/*.log', flags=glob.G, root_dir=self.tempdir, min_size=100),
+            [os.path.join('a', 'b', 'big.log')]
+        )
+        self.assert_equal(
+            sorted(glob.glob('**/*.log', flags=glob.G, root_dir=self.tempdir, min_size=1, max_size=100)),
+            [os.path.join('a', 'small.log')]
+        )
+
+    def test_time(self):
+        """Test filtering by modified time."""
+
+        self.assert_equal(glob.glob('*.log', root_dir=self.tempdir, older_than=1000000001), ['old.log'])
+        self.assert_equal(glob.glob('*.log', root_dir=self.tempdir, newer_than=1000000001), [])
+        self.assert_equal(
+            sorted(glob.glob('**/*.log', flags=glob.G, root_dir=self.tempdir, newer_than=1000000001)),
+            sorted([os.path.join('a', 'small.log'), os.path.join('a', 'b', 'big.log')])
+        )
+
+    @pytest.mark.skipif(not glob.SUPPORT_DIR_FD, reason="dir_fd is not supported on this system")
+    def test_dir_fd(self):
+        """Test predicates when crawling with a file descriptor."""
+
+        dir_fd = os.open(self.tempdir, os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            self.assert_equal(glob.glob('*.log', dir_fd=dir_fd, older_than=1000000001), ['old.log'])
+            self.assert_equal(glob.glob('*.log', dir_fd=dir_fd, max_size=0), ['old.log'])
+            self.assert_equal(glob.glob('a/*.log', dir_fd=dir_fd, min_size=1), [os.path.join('a', 'small.log')])
+            self.assert_equal(
+                sorted(glob.glob('**/*.log', flags=glob.G, dir_fd=dir_fd, max_size=100)),
+                sorted(['old.log', os.path.join('a', 'small.log')])
+            )
+            self.assert_equal(
+                sorted(glob.glob('**', flags=glob.G, dir_fd=dir_fd, types='file', min_size=0)),
+                sorted(['old.log', os.path.join('a', 'small.log'), os.path.join('a', 'b', 'big.log')])
+            )
+        finally:
+            os.close(dir_fd)
+
+
+class TestGlobDepth(_TestGlob):
+    """Test `globstar` depth limits."""
+
+    @classmethod
+    def setup_fs(cls):
+        """Setup file system."""
+
+        cls.mktemp('p')
+        cls.mktemp('a', 'p')
+        cls.mktemp('a', 'b', 'p')
+        cls.mktemp('a', 'b', 'c', 'p')
+
+    def test_max_depth(self):
+        """Test maximum depth."""
+
+        self.assert_equal(glob.glob('**/p', flags=glob.G, root_dir=self.tempdir, max_depth=0), ['p'])
+        self.assert_equal(
+            sorted(glob.glob('**/p', flags=glob.G, root_dir=self.tempdir, max_depth=1)),
+            sorted(['p', os.path.join('a', 'p')])
+        )
+        self.assert_equal(
+            sorted(glob.glob('a/**', flags=glob.G, root_dir=self.tempdir, max_depth=1)),
+            sorted([os.path.join('a', ''), os.path.join('a', 'b'), os.path.join('a', 'p')])
+        )
+
+    def test_min_depth(self):
+        """Test minimum depth."""
+
+        self.assert_equal(
+            sorted(glob.glob('**/p', flags=glob.G, root_dir=self.tempdir, min_depth=2)),
+            sorted([os.path.join('a', 'b', 'p'), os.path.join('a', 'b', 'c', 'p')])
+        )
+        self.assert_equal(
+            sorted(glob.glob('a/**', flags=glob.G, root_dir=self.tempdir, min_depth=2, max_depth=2)),
+            sorted([os.path.join('a', 'b', 'p'), os.path.join('a', 'b', 'c')])
+        )
+
+    def test_bad_depth(self):
+        """Test bad depth limits."""
+
+        with pytest.raises(ValueError):
+            glob.glob('**', flags=glob.G, root_dir=self.tempdir, max_depth=-1)
+
+        with pytest.raises(ValueError):
+            glob.glob('**', flags=glob.G, root_dir=self.tempdir, min_depth=2, max_depth=1)
+
+
+class TestFirstExistsCount(_TestGlob):
+    """Test `first`, `exists`, and `count`."""
+
+    @classmethod
+    def setup_fs(cls):
+        """Setup file system."""
+
+        cls.mktemp('a', 'x.txt')
+        cls.mktemp('a', 'y.txt')
+        cls.mktemp('b', 'x.txt')
+
+    def test_first(self):
+        """Test first."""
+
+        self.assert_equal(
+            glob.first('*/x.txt', root_dir=self.tempdir) in glob.glob('*/x.txt', root_dir=self.tempdir),
+            True
+        )
+        self.assert_equal(glob.first('a/', root_dir=self.tempdir), os.path.join('a', ''))
+        self.assert_equal(glob.first('*/z.txt', root_dir=self.tempdir), None)
+
+    def test_exists(self):
+        """Test exists."""
+
+        self.assert_equal(glob.exists('**/y.txt', flags=glob.G, root_dir=self.tempdir), True)
+        self.assert_equal(glob.exists('**/z.txt', flags=glob.G, root_dir=self.tempdir), False)
+        self.assert_equal(glob.exists(['**/*.txt', '!**/*.txt'], flags=glob.G | glob.N, root_dir=self.tempdir), False)
+
+    def test_count(self):
+        """Test count."""
+
+        self.assert_equal(glob.count('**/*.txt', flags=glob.G, root_dir=self.tempdir), 3)
+        self.assert_equal(glob.count(['**/*.txt', 'a/*.txt'], flags=glob.G, root_dir=self.tempdir), 3)
+        self.assert_equal(glob.count(['**/*.txt', 'a/*.txt'], flags=glob.G | glob.Q, root_dir=self.tempdir), 5)
+        self.assert_equal(glob.count('**/*.txt', flags=glob.G, root_dir=self.tempdir, max_depth=0), 0)
+
+
+class TestGlobPlan(_TestGlob):
+    """Test `GlobPlan`."""
+
+    @classmethod
+    def setup_fs(cls):
+        """Setup file system."""
+
+        cls.mktemp('a', 'x.txt')
+        cls.mktemp('a', 'y.txt')
+        cls.mktemp('a', 'c', 'x.txt')
+        cls.mktemp('b', 'x.txt')
+
+    def test_plan(self):
+        """Test running a plan against multiple roots and multiple times."""
+
+        patterns = ['**/x.txt', '*.txt']
+        plan = glob.GlobPlan(patterns, flags=glob.G)
+        for root in ('', 'a', 'b', 'a'):
+            root_dir = self.norm(root)
+            self.assert_equal(
+                sorted(plan.run(root_dir=root_dir)),
+                sorted(glob.glob(patterns, flags=glob.G, root_dir=root_dir))
+            )
+
+    def test_plan_threads(self):
+        """Test running a plan from multiple threads."""
+
+        plan = glob.GlobPlan(['**/*.txt', 'a/*.txt'], flags=glob.G)
+        roots = [self.norm(root) for root in ('', 'a', 'b')] * 10
+        expected = [sorted(plan.run(root_dir=root)) for root in roots]
+        with concurrent.futures.ThreadPoolExecutor(max_workers=4) as executor:
+            results = list(executor.map(lambda root: sorted(plan.run(root_dir=root)), roots))
+        self.assert_equal(results, expected)
+
+    def test_plan_type(self):
+        """Test that the root must match the pattern type."""
+
+        plan = glob.GlobPlan(b'*')
+        with pytest.raises(TypeError):
+            plan.run(root_dir=self.tempdir)
+        self.assert_equal(sorted(plan.run(root_dir=os.fsencode(self.tempdir))), [b'a', b'b'])
+
+    def test_plan_immutable(self):
+        """Test that a plan is immutable."""
+
+        plan = glob.GlobPlan('*')
+        with pytest.raises(AttributeError):
+            plan._glob = None
+
+
+class TestMultiRoot(_TestGlob):
+    """Test globbing multiple roots."""
+
+    @classmethod
+    def setup_fs(cls):
+        """Setup file system."""
+
+        cls.mktemp('a', 'x.txt')
+        cls.mktemp('a', 'c', 'x.txt')
+        cls.mktemp('b', 'x.txt')
+        cls.mktemp('b', 'y.txt')
+
+    def expected(self, patterns, roots):
+        """Get the expected results by globbing each root separately."""
+
+        return [
+            (root, path) for root in roots
+            for path in glob.glob(patterns, flags=glob.G, root_dir=root)
+        ]
+
+    def test_roots(self):
+        """Test multiple roots."""
+
+        roots = [self.norm('a'), self.norm('b'), self.norm('a')]
+        self.assert_equal(glob.glob('**/x.txt', flags=glob.G, root_dirs=roots), self.expected('**/x.txt', roots))
+
+    def test_roots_workers(self):
+        """Test multiple roots with workers."""
+
+        roots = [self.norm('a'), self.norm('b')] * 5
+        self.assert_equal(
+            glob.glob('**/*.txt', flags=glob.G, root_dirs=roots, workers=3),
+            self.expected('**/*.txt', roots)
+        )
+
+    def test_roots_early_exit(self):
+        """Test stopping early with workers."""
+
+        roots = [self.norm('a'), self.norm('b')] * 5
+        results = glob.iglob('**/*.txt', flags=glob.G, root_dirs=roots, workers=2)
+        self.assert_equal(next(results), self.expected('**/*.txt', roots)[0])
+        results.close()
+
+    def test_roots_queue(self):
+        """Test that workers hand over results through a bounded queue."""
+
+        roots = [self.norm('a'), self.norm('b')] * 5
+        expected = self.expected('**/*.txt', roots)
+        with mock.patch('wcmatch.glob._ROOT_QUEUE_SIZE', 1):
+            self.assert_equal(glob.glob('**/*.txt', flags=glob.G, root_dirs=roots, workers=3), expected)
+
+            # Workers waiting on a full queue must not keep us from stopping.
+            results = glob.iglob('**/*.txt', flags=glob.G, root_dirs=roots, workers=3)
+            self.assert_equal([next(results), next(results)], expected[:2])
+            results.close()
+
+    def test_roots_worker_error(self):
+        """Test that an error in a worker is raised."""
+
+        def prune(path, entry):
+            """Fail on a directory."""
+
+            raise RuntimeError('failed')
+
+        roots = [self.norm('a'), self.norm('b')]
+        with pytest.raises(RuntimeError):
+            glob.glob('**/*.txt', flags=glob.G, root_dirs=roots, workers=2, prune=prune)
+
+    def test_single_root(self):
+        """Test a single root given as a string."""
+
+        root = self.norm('b')
+        self.assert_equal(glob.glob('*.txt', flags=glob.G, root_dirs=root), self.expected('*.txt', [root]))
+
+    def test_roots_bad_args(self):
+        """Test bad arguments."""
+
+        with pytest.raises(ValueError):
+            glob.glob('*', root_dir=self.tempdir, root_dirs=[self.tempdir])
+
+        with pytest.raises(ValueError):
+            glob.glob('*', root_dirs=[self.tempdir], workers=0)
+
+
+class TestSorted(_TestGlob):
+    """Test sorted results and paging."""
+
+    @classmethod
+    def setup_fs(cls):
+        """Setup file system."""
+
+        cls.mktemp('a', 'x.txt')
+        cls.mktemp('a', 'b', 'x.txt')
+        cls.mktemp('a', 'b', 'y.txt')
+        cls.mktemp('a', 'x', 'x.txt')
+        cls.mktemp('a-b', 'x.txt')
+        cls.mktemp('b', 'x.txt')
+        cls.mktemp('x.txt')
+
+    def get_pages(self, patterns, page_size, **kwargs):
+        """Get all the pages."""
+
+        root_dir = os.fsencode(self.tempdir) if isinstance(patterns, bytes) else self.tempdir
+        pages = []
+        cursor = None
+        while True:
+            results, cursor = glob.page(patterns, page_size=page_size, cursor=cursor, root_dir=root_dir, **kwargs)
+            pages.append(results)
+            if cursor is None:
+                break
+        return pages
+
+    def test_page(self):
+        """Test paging through results in sorted order."""
+
+        expected = [
+            os.path.join(*parts) for parts in (
+                ('a', 'b', 'x.txt'), ('a', 'x', 'x.txt'), ('a', 'x.txt'), ('a-b', 'x.txt'), ('b', 'x.txt'), ('x.txt',)
+            )
+        ]
+        for page_size in range(1, 8):
+            pages = self.get_pages('**/x.txt', page_size, flags=glob.G)
+            self.assert_equal([r for page in pages for r in page], expected)
+            self.assert_equal(all(len(page) == page_size for page in pages[:-1]), True)
+
+    def test_page_patterns(self):
+        """Test paging through the merged results of multiple patterns."""
+
+        patterns = ['**/x.txt', 'a/**', '*/b/*']
+        expected = sorted(
+            glob.glob(patterns, flags=glob.G, root_dir=self.tempdir),
+            key=lambda p: tuple(p.split(os.sep))
+        )
+        for page_size in (1, 2, 5):
+            pages = self.get_pages(patterns, page_size, flags=glob.G)
+            self.assert_equal([r for page in pages for r in page], expected)
+
+    def test_page_bytes(self):
+        """Test paging with bytes."""
+
+        pages = self.get_pages(b'*/*.txt', 1)
+        self.assert_equal(
+            [r for page in pages for r in page],
+            [os.path.join(b'a', b'x.txt'), os.path.join(b'a-b', b'x.txt'), os.path.join(b'b', b'x.txt')]
+        )
+
+    def test_page_empty(self):
+        """Test a page with no results."""
+
+        self.assert_equal(glob.page('*.md', root_dir=self.tempdir), ([], None))
+
+    def test_sort(self):
+        """Test sorted results."""
+
+        patterns = ['**/x.txt', '*/b/*', '*', 'a/**']
+        results = glob.glob(patterns, flags=glob.G | glob.MARK, root_dir=self.tempdir, sort=True)
+        self.assert_equal(results, sorted(results, key=lambda p: tuple(p.rstrip(os.sep).split(os.sep))))
+        self.assert_equal(
+            sorted(results),
+            sorted(glob.glob(patterns, flags=glob.G | glob.MARK, root_dir=self.tempdir))
+        )
+
+    def test_sort_follows_directory(self):
+        """Test that everything under a directory directly follows it."""
+
+        self.assert_equal(
+            glob.glob('**', flags=glob.G, root_dir=self.norm('a'), sort=True),
+            ['b', os.path.join('b', 'x.txt'), os.path.join('b', 'y.txt'), 'x', os.path.join('x', 'x.txt'), 'x.txt']
+        )
+
+    def test_page_bad(self):
+        """Test bad page arguments."""
+
+        with pytest.raises(ValueError):
+            glob.page('*', page_size=0, root_dir=self.tempdir)
+
+        with pytest.raises(ValueError):
+            glob.page('*', cursor='not a cursor', root_dir=self.tempdir)
+
+        with pytest.raises(ValueError):
+            glob.page('*', cursor='e30=', root_dir=self.tempdir)
+
+        with pytest.raises(ValueError):
+            glob.page('*', flags=glob.Q, root_dir=self.tempdir)
+
+        with pytest.raises(ValueError):
+            glob.page('*', follow_once=True, root_dir=self.tempdir)
+
+    def test_page_ignorecase(self):
+        """Test that paging with case insensitive patterns returns the same results as sorted glob."""
+
+        if util.is_case_sensitive():
+            self.mktemp('A', 'X.txt')
+
+        try:
+            patterns = ['**/X.txt', 'A/**', '*/b/*', '*']
+            flags = glob.G | glob.I | glob.MARK
+            expected = glob.glob(patterns, flags=flags, root_dir=self.tempdir, sort=True)
+            self.assert_equal(bool(expected), True)
+            for page_size in (1, 2, 5):
+                pages = self.get_pages(patterns, page_size, flags=flags)
+                self.assert_equal([r for page in pages for r in page], expected)
+        finally:
+            if util.is_case_sensitive():
+                shutil.rmtree(self.norm('A'))
+
+
+class TestBreadthFirst(_TestGlob):
+    """Test breadth first crawling."""
+
+    @classmethod
+    def setup_fs(cls):
+        """Setup file system."""
+
+        cls.mktemp('a', 'b', 'c', 'x.txt')
+        cls.mktemp('a', 'b', 'x.txt')
+        cls.mktemp('a', 'x.txt')
+        cls.mktemp('d', 'x.txt')
+        cls.mktemp('x.txt')
+
+    def test_bfs(self):
+        """Test that shallow results come first."""
+
+        results = glob.glob('**/x.txt', flags=glob.G, root_dir=self.tempdir, order='bfs')
+        self.assert_equal([r.count(os.sep) for r in results], [0, 1, 1, 2, 3])
+        self.assert_equal(sorted(results), sorted(glob.glob('**/x.txt', flags=glob.G, root_dir=self.tempdir)))
+
+    def test_bfs_queue_limit(self):
+        """Test that we still find everything when the queue is full."""
+
+        for max_queue in (1, 2):
+            self.assert_equal(
+                sorted(glob.glob('**', flags=glob.G, root_dir=self.tempdir, order='bfs', max_queue=max_queue)),
+                sorted(glob.glob('**', flags=glob.G, root_dir=self.tempdir))
+            )
+
+    def test_bfs_depth(self):
+        """Test breadth first with depth limits."""
+
+        self.assert_equal(
+            glob.glob('**/x.txt', flags=glob.G, root_dir=self.tempdir, order='bfs', min_depth=1, max_depth=1),
+            glob.glob('**/x.txt', flags=glob.G, root_dir=self.tempdir, min_depth=1, max_depth=1)
+        )
+
+    def test_bfs_bad(self):
+        """Test bad breadth first options."""
+
+        with pytest.raises(ValueError):
+            glob.glob('**', flags=glob.G, root_dir=self.tempdir, order='random')
+
+        with pytest.raises(ValueError):
+            glob.glob('**', flags=glob.G, root_dir=self.tempdir, order='bfs', sort=True)
+
+        with pytest.raises(ValueError):
+            glob.glob('**', flags=glob.G, root_dir=self.tempdir, order='bfs', max_queue=0)
+
+        with pytest.raises(ValueError):
+            glob.page('**', flags=glob.G, root_dir=self.tempdir, order='bfs')
+
+
+class TestScanBudget(_TestGlob):
+    """Test deadline and entry limits."""
+
+    @classmethod
+    def setup_fs(cls):
+        """Setup file system."""
+
+        cls.mktemp('a', 'b', 'x.txt')
+        cls.mktemp('a', 'x.txt')
+        cls.mktemp('c', 'x.txt')
+        cls.mktemp('x.txt')
+
+    def test_max_entries(self):
+        """Test that the crawl stops when it has seen enough entries."""
+
+        expected = glob.glob('**', flags=glob.G, root_dir=self.tempdir)
+        results = glob.iglob('**', flags=glob.G, root_dir=self.tempdir, max_entries=4)
+        found = list(results)
+        self.assert_equal(0 < len(found) < len(expected), True)
+        self.assert_equal(set(found) <= set(expected), True)
+        self.assert_equal(results.truncated, True)
+
+    def test_max_entries_glob(self):
+        """Test that `glob` reports whether the crawl stopped early."""
+
+        results = glob.glob('**', flags=glob.G, root_dir=self.tempdir, max_entries=4)
+        self.assert_equal(results, list(glob.iglob('**', flags=glob.G, root_dir=self.tempdir, max_entries=4)))
+        self.assert_equal(results.truncated, True)
+
+        results = glob.glob('**', flags=glob.G, root_dir=self.tempdir, max_entries=100)
+        self.assert_equal(results.truncated, False)
+
+        results = glob.glob('**', flags=glob.G, root_dirs=[self.tempdir], deadline=0)
+        self.assert_equal(results, [])
+        self.assert_equal(results.truncated, True)
+
+    def test_not_truncated(self):
+        """Test a budget big enough to finish the crawl."""
+
+        results = glob.iglob('**', flags=glob.G, root_dir=self.tempdir, max_entries=100)
+        self.assert_equal(sorted(results), sorted(glob.glob('**', flags=glob.G, root_dir=self.tempdir)))
+        self.assert_equal(results.truncated, False)
+
+    def test_deadline(self):
+        """Test that the crawl stops when the deadline passes."""
+
+        results = glob.iglob('**', flags=glob.G, root_dir=self.tempdir, deadline=0)
+        self.assert_equal(list(results), [])
+        self.assert_equal(results.truncated, True)
+
+    def test_plan(self):
+        """Test that each run of a plan gets its own budget."""
+
+        plan = glob.GlobPlan('**', flags=glob.G, max_entries=4)
+        first = plan.run(self.tempdir)
+        expected = list(first)
+        self.assert_equal(first.truncated, True)
+        second = plan.run(self.tempdir)
+        self.assert_equal(list(second), expected)
+        self.assert_equal(second.truncated, True)
+
+    def test_page(self):
+        """Test that a truncated page still gives us a cursor to continue with."""
+
+        expected = glob.glob('**', flags=glob.G, root_dir=self.tempdir, sort=True)
+        results = []
+        cursor = None
+        pages = 0
+        while True:
+            page, cursor = glob.page('**', flags=glob.G, root_dir=self.tempdir, cursor=cursor, max_entries=6)
+            pages += 1
+            results.extend(page)
+            if cursor is None:
+                break
+        self.assert_equal(results, expected)
+        self.assert_equal(pages, 2)
+
+    def test_page_no_progress(self):
+        """Test that paging with a budget too small to get past the cursor doesn't loop forever."""
+
+        cursor = None
+        with pytest.raises(ValueError):
+            for _ in range(100):
+                page, cursor = glob.page(
+                    '**', flags=glob.G, root_dir=self.tempdir, page_size=2, cursor=cursor, max_entries=3
+                )
+                if cursor is None:
+                    break
+
+    def test_budget_bad(self):
+        """Test bad budgets."""
+
+        with pytest.raises(ValueError):
+            glob.glob('**', flags=glob.G, root_dir=self.tempdir, deadline=-1)
+
+        with pytest.raises(ValueError):
+            glob.glob('**', flags=glob.G, root_dir=self.tempdir, max_entries=-1)
+
+
+class TestPrune(_TestGlob):
+    """Test pruning directories with a callback."""
+
+    @classmethod
+    def setup_fs(cls):
+        """Setup file system."""
+
+        cls.mktemp('a', 'b', 'x.txt')
+        cls.mktemp('a', 'x.txt')
+        cls.mktemp('c', '.nobackup')
+        cls.mktemp('c', 'd', 'x.txt')
+        cls.mktemp('c', 'x.txt')
+        cls.mktemp('x.txt')
+
+    def prune(self, path, entry):
+        """Prune directories with a `.nobackup` marker."""
+
+        self.pruned.append(path)
+        return os.path.exists(os.path.join(entry.path, '.nobackup'))
+
+    def setup_method(self):
+        """Setup."""
+
+        self.pruned = []
+
+    @staticmethod
+    def nlist(paths):
+        """Normalize a list of paths."""
+
+        return [os.path.normpath(path) for path in paths]
+
+    def test_prune_globstar(self):
+        """Test that pruned directories are not crawled."""
+
+        self.assert_equal(
+            sorted(glob.glob('**/x.txt', flags=glob.G, root_dir=self.tempdir, prune=self.prune)),
+            self.nlist(['a/b/x.txt', 'a/x.txt', 'x.txt'])
+        )
+        self.assert_equal(sorted(self.pruned), self.nlist(['a', 'a/b', 'c']))
+
+    def test_prune_result(self):
+        """Test that a pruned directory can still be a result."""
+
+        self.assert_equal(
+            sorted(glob.glob('**', flags=glob.G, root_dir=self.tempdir, prune=self.prune)),
+            self.nlist(['a', 'a/b', 'a/b/x.txt', 'a/x.txt', 'c', 'x.txt'])
+        )
+
+    def test_prune_directory_pattern(self):
+        """Test that directories matched by a directory pattern are pruned."""
+
+        self.assert_equal(
+            sorted(glob.glob('*/x.txt', root_dir=self.tempdir, prune=self.prune)),
+            self.nlist(['a/x.txt'])
+        )
+
+    def test_prune_bfs(self):
+        """Test pruning while crawling breadth first."""
+
+        self.assert_equal(
+            sorted(glob.glob('**/x.txt', flags=glob.G, root_dir=self.tempdir, prune=self.prune, order='bfs')),
+            self.nlist(['a/b/x.txt', 'a/x.txt', 'x.txt'])
+        )
+
+    def test_prune_cache(self):
+        """Test that entries are provided when listings come from a cache."""
+
+        self.assert_equal(
+            sorted(
+                glob.glob('**/x.txt', flags=glob.G, root_dir=self.tempdir, prune=self.prune, cache=glob.DirCache())
+            ),
+            self.nlist(['a/b/x.txt', 'a/x.txt', 'x.txt'])
+        )
+
+    @pytest.mark.skipif(not glob.SUPPORT_DIR_FD, reason="dir_fd is not supported on this system")
+    def test_prune_dir_fd(self):
+        """Test that entries given to the callback are usable when crawling with a file descriptor."""
+
+        def prune(path, entry):
+            self.pruned.append(path)
+            return entry.is_dir() and entry.stat().st_nlink < 0
+
+        dir_fd = os.open(self.tempdir, os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            for patterns in ('**/x.txt', ['**/x.txt', '*/x.txt']):
+                self.pruned = []
+                self.assert_equal(
+                    sorted(glob.glob(patterns, flags=glob.G, dir_fd=dir_fd, prune=prune)),
+                    self.nlist(['a/b/x.txt', 'a/x.txt', 'c/d/x.txt', 'c/x.txt', 'x.txt'])
+                )
+                self.assert_equal(sorted(set(self.pruned)), self.nlist(['a', 'a/b', 'c', 'c/d']))
+        finally:
+            os.close(dir_fd)
+
+
 class TestGlobCornerCase(_TestGlob):
     """
     Some tests that need a very specific file set to test against for corner cases.
@@ -1503,6 +2465,61 @@ class TestSymlinkLoopGlob(unittest.TestCase):
                 results.remove(path)
                 depth += 1
 
+    def test_selflink_bounded(self):
+        """Test that self links are not followed endlessly."""
+
+        tempdir = TESTFN + "_dir"
+        os.makedirs(tempdir)
+        self.addCleanup(shutil.rmtree, tempdir)
+        with change_cwd(tempdir):
+            os.makedirs('dir')
+            create_empty_file(os.path.join('dir', 'file'))
+            os.symlink(os.curdir, os.path.join('dir', 'link'))
+
+            self.assertEqual(
+                sorted(glob.glob('**', flags=self.DEFAULT_FLAGS)),
+                sorted(['dir', os.path.join('dir', 'file'), os.path.join('dir', 'link')])
+            )
+
+    def test_selflink_bfs(self):
+        """Test self links when crawling breadth first."""
+
+        tempdir = TESTFN + "_dir"
+        os.makedirs(tempdir)
+        self.addCleanup(shutil.rmtree, tempdir)
+        with change_cwd(tempdir):
+            os.makedirs('dir')
+            create_empty_file(os.path.join('dir', 'file'))
+            os.symlink(os.curdir, os.path.join('dir', 'link'))
+
+            for max_queue in (1, 10000):
+                self.assertEqual(
+                    sorted(glob.glob('**', flags=self.DEFAULT_FLAGS, order='bfs', max_queue=max_queue)),
+                    sorted(glob.glob('**', flags=self.DEFAULT_FLAGS))
+                )
+
+    def test_follow_once(self):
+        """Test that directories reachable by more than one symlink are only crawled once."""
+
+        tempdir = TESTFN + "_dir"
+        os.makedirs(tempdir)
+        self.addCleanup(shutil.rmtree, tempdir)
+        with change_cwd(tempdir):
+            os.makedirs(os.path.join('real', 'sub'))
+            create_empty_file(os.path.join('real', 'sub', 'file'))
+            os.makedirs('links')
+            os.symlink(os.path.join('..', 'real'), os.path.join('links', 'a'))
+            os.symlink(os.path.join('..', 'real'), os.path.join('links', 'b'))
+
+            results = glob.glob('links/**/file', flags=self.DEFAULT_FLAGS)
+            self.assertEqual(
+                sorted(results),
+                sorted([os.path.join('links', 'a', 'sub', 'file'), os.path.join('links', 'b', 'sub', 'file')])
+            )
+
+            results = glob.glob('links/**/file', flags=self.DEFAULT_FLAGS, follow_once=True)
+            self.assertEqual(len(results), 1)
+
 
 class TestGlobPaths(unittest.TestCase):
     """Test `glob` paths."""
@@ -92,6 +92,21 @@ class TestGlob(unittest.TestCase):
         self.assertTrue(len(results))
         self.assertTrue(all([file.suffix == '.md' for file in results]))
 
+    def test_rglob_depth(self):
+        """Test recursive globbing with depth limits."""
+
+        p = pathlib.Path('docs')
+        results = list(p.rglob('*.md', max_depth=1))
+        self.assertTrue(not results)
+
+        results = list(p.rglob('*.md', max_depth=2))
+        self.assertTrue(len(results))
+        self.assertTrue(all([len(file.relative_to(p).parts) == 3 for file in results]))
+
+        results = list(p.rglob('*.md', min_depth=3))
+        self.assertTrue(len(results))
+        self.assertTrue(all([len(file.relative_to(p).parts) > 3 for file in results]))
+
     def test_integrity(self):
         """Test glob integrity, or better put, test the path structure comes out sane."""
 
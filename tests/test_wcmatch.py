@@ -2,8 +2,12 @@
 """Tests for `wcmatch`."""
 import unittest
 import os
+import asyncio
 import wcmatch.wcmatch as wcmatch
 import shutil
+import threading
+import time
+from unittest import mock
 from wcmatch import _wcparse
 
 
@@ -313,6 +317,295 @@ class TestWcmatch(_TestWcmatch):
 
         self.assertTrue(records == 0 or walker.get_skipped() == 0)
 
+    def test_max_entries(self):
+        """Test stopping the walk after a number of entries."""
+
+        walker = wcmatch.WcMatch(
+            self.tempdir,
+            '*.txt*',
+            flags=self.default_flags | wcmatch.RECURSIVE | wcmatch.HIDDEN,
+            max_entries=1
+        )
+
+        self.crawl_files(walker)
+        self.assertTrue(walker.is_truncated())
+        self.assertTrue(len(self.files) <= 1)
+
+        walker = wcmatch.WcMatch(
+            self.tempdir,
+            '*.txt*',
+            flags=self.default_flags | wcmatch.RECURSIVE | wcmatch.HIDDEN,
+            max_entries=100
+        )
+
+        self.files = []
+        self.crawl_files(walker)
+        self.assertFalse(walker.is_truncated())
+        self.assertEqual(sorted(self.files), self.norm_list(['.hidden/a.txt', 'a.txt', 'c.txt.bak']))
+
+    def test_deadline(self):
+        """Test stopping the walk when the deadline passes."""
+
+        walker = wcmatch.WcMatch(
+            self.tempdir,
+            '*.txt*',
+            flags=self.default_flags | wcmatch.RECURSIVE | wcmatch.HIDDEN,
+            deadline=0
+        )
+
+        self.crawl_files(walker)
+        self.assertTrue(walker.is_truncated())
+        self.assertEqual(self.files, [])
+
+        with self.assertRaises(ValueError):
+            wcmatch.WcMatch(self.tempdir, '*.txt*', deadline=-1)
+
+    def test_workers(self):
+        """Test crawling with worker threads in order."""
+
+        flags = self.default_flags | wcmatch.RECURSIVE | wcmatch.HIDDEN
+        expected = wcmatch.WcMatch(self.tempdir, '*.txt*', flags=flags).match()
+        walker = wcmatch.WcMatch(self.tempdir, '*.txt*', flags=flags, workers=2)
+
+        self.assertEqual(walker.match(), expected)
+
+    def test_workers_unordered(self):
+        """Test crawling with worker threads in any order."""
+
+        walker = wcmatch.WcMatch(
+            self.tempdir,
+            '*.txt*',
+            flags=self.default_flags | wcmatch.RECURSIVE | wcmatch.HIDDEN,
+            workers=2,
+            ordered=False
+        )
+
+        self.crawl_files(walker)
+        self.assertEqual(sorted(self.files), self.norm_list(['.hidden/a.txt', 'a.txt', 'c.txt.bak']))
+        self.assertEqual(self.skipped, 3)
+
+    def test_workers_hooks(self):
+        """Test that hooks are called from the thread consuming the results."""
+
+        threads = set()
+
+        class Walker(wcmatch.WcMatch):
+            def on_validate_directory(self, base, name):
+                threads.add(threading.get_ident())
+                return True
+
+            def on_validate_file(self, base, name):
+                threads.add(threading.get_ident())
+                return True
+
+        for ordered in (True, False):
+            walker = Walker(
+                self.tempdir,
+                '*.txt*',
+                flags=self.default_flags | wcmatch.RECURSIVE | wcmatch.HIDDEN,
+                workers=2,
+                ordered=ordered
+            )
+            walker.match()
+        self.assertEqual(threads, {threading.get_ident()})
+
+    def test_workers_abort(self):
+        """Test aborting when crawling with worker threads."""
+
+        for ordered in (True, False):
+            walker = wcmatch.WcMatch(
+                self.tempdir,
+                '*.txt*',
+                flags=self.default_flags | wcmatch.RECURSIVE | wcmatch.HIDDEN,
+                workers=2,
+                ordered=ordered
+            )
+
+            records = 0
+            for f in walker.imatch():
+                records += 1
+                walker.kill()
+            self.assertEqual(records, 1)
+
+        with self.assertRaises(ValueError):
+            wcmatch.WcMatch(self.tempdir, '*.txt*', workers=0)
+
+    def test_processes(self):
+        """Test crawling with worker processes."""
+
+        for shard_size in (1, 10000):
+            with mock.patch.object(wcmatch, '_SHARD_SIZE', shard_size):
+                walker = wcmatch.WcMatch(
+                    self.tempdir,
+                    '*.txt*',
+                    flags=self.default_flags | wcmatch.RECURSIVE | wcmatch.HIDDEN,
+                    processes=2
+                )
+
+                self.files = []
+                self.crawl_files(walker)
+                self.assertEqual(sorted(self.files), self.norm_list(['.hidden/a.txt', 'a.txt', 'c.txt.bak']))
+                self.assertEqual(self.skipped, 3)
+
+    def test_processes_abort(self):
+        """Test aborting when crawling with worker processes."""
+
+        with mock.patch.object(wcmatch, '_SHARD_SIZE', 1):
+            walker = wcmatch.WcMatch(
+                self.tempdir,
+                '*.txt*',
+                flags=self.default_flags | wcmatch.RECURSIVE | wcmatch.HIDDEN,
+                processes=2
+            )
+
+            records = 0
+            for f in walker.imatch():
+                records += 1
+                walker.kill()
+            self.assertEqual(records, 1)
+
+    def test_processes_bad(self):
+        """Test bad process options."""
+
+        with self.assertRaises(ValueError):
+            wcmatch.WcMatch(self.tempdir, '*.txt*', processes=0)
+
+        with self.assertRaises(ValueError):
+            wcmatch.WcMatch(self.tempdir, '*.txt*', processes=2, workers=2)
+
+        with self.assertRaises(ValueError):
+            wcmatch.WcMatch(self.tempdir, '*.txt*', processes=2, cache=wcmatch.DirCache())
+
+    def run_async(self, coro):
+        """Run a coroutine in a new event loop."""
+
+        loop = asyncio.new_event_loop()
+        try:
+            return loop.run_until_complete(coro)
+        finally:
+            loop.close()
+
+    def test_aimatch(self):
+        """Test crawling asynchronously."""
+
+        async def crawl(walker):
+            return [f async for f in walker.aimatch()]
+
+        flags = self.default_flags | wcmatch.RECURSIVE | wcmatch.HIDDEN
+        expected = wcmatch.WcMatch(self.tempdir, '*.txt*', flags=flags).match()
+
+        walker = wcmatch.WcMatch(self.tempdir, '*.txt*', flags=flags)
+        self.assertEqual(self.run_async(crawl(walker)), expected)
+        self.assertEqual(walker.get_skipped(), 3)
+
+        walker = wcmatch.WcMatch(self.tempdir, '*.txt*', flags=flags, workers=2, ordered=False)
+        self.assertEqual(sorted(self.run_async(crawl(walker))), sorted(expected))
+
+    def test_aimatch_abort(self):
+        """Test aborting an asynchronous crawl."""
+
+        async def crawl(walker):
+            records = 0
+            async for f in walker.aimatch():
+                records += 1
+                walker.kill()
+            return records
+
+        for ordered in (True, False):
+            walker = wcmatch.WcMatch(
+                self.tempdir,
+                '*.txt*',
+                flags=self.default_flags | wcmatch.RECURSIVE | wcmatch.HIDDEN,
+                ordered=ordered
+            )
+            self.assertEqual(self.run_async(crawl(walker)), 1)
+
+    def test_aimatch_cancel(self):
+        """Test cancelling the task running an asynchronous crawl."""
+
+        files = []
+
+        async def crawl(walker):
+            async for f in walker.aimatch():
+                files.append(f)
+
+        async def cancel(walker):
+            task = asyncio.ensure_future(crawl(walker))
+            await asyncio.sleep(0)
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                return True
+            return False
+
+        walker = wcmatch.WcMatch(
+            self.tempdir,
+            '*.txt*',
+            flags=self.default_flags | wcmatch.RECURSIVE | wcmatch.HIDDEN
+        )
+        self.assertTrue(self.run_async(cancel(walker)))
+        self.assertEqual(files, [])
+
+    def test_step(self):
+        """Test stepping through a search."""
+
+        flags = self.default_flags | wcmatch.RECURSIVE | wcmatch.HIDDEN
+        expected = wcmatch.WcMatch(self.tempdir, '*.txt*', flags=flags).match()
+
+        for max_entries in (1, 2, 3):
+            walker = wcmatch.WcMatch(self.tempdir, '*.txt*', flags=flags)
+            files = []
+            steps = 0
+            while True:
+                result = walker.step(max_entries=max_entries)
+                self.assertTrue(len(result.results) <= max_entries)
+                files.extend(result.results)
+                steps += 1
+                if result.finished:
+                    break
+            self.assertEqual(files, expected)
+            self.assertEqual(steps, -(-7 // max_entries))
+            self.assertEqual(result.dirs_done, 2)
+            self.assertEqual(result.dirs_queued, 0)
+            self.assertEqual(result.skipped, 3)
+
+        # The first step only gets through the entries of the root directory.
+        walker = wcmatch.WcMatch(self.tempdir, '*.txt*', flags=flags)
+        result = walker.step(max_entries=5)
+        self.assertEqual(result.results, expected[:2])
+        self.assertFalse(result.finished)
+        self.assertEqual(result.dirs_done, 1)
+        self.assertEqual(result.dirs_queued, 1)
+        self.assertEqual(walker.step().results, expected[2:])
+
+        # A finished search starts over.
+        self.assertEqual(walker.step().results, expected)
+
+    def test_step_seconds(self):
+        """Test stepping through a search by time."""
+
+        flags = self.default_flags | wcmatch.RECURSIVE | wcmatch.HIDDEN
+        expected = wcmatch.WcMatch(self.tempdir, '*.txt*', flags=flags).match()
+
+        walker = wcmatch.WcMatch(self.tempdir, '*.txt*', flags=flags)
+        files = []
+        while True:
+            result = walker.step(max_seconds=0)
+            files.extend(result.results)
+            if result.finished:
+                break
+        self.assertEqual(files, expected)
+
+    def test_step_bad(self):
+        """Test bad step options."""
+
+        with self.assertRaises(ValueError):
+            wcmatch.WcMatch(self.tempdir, '*.txt*').step(max_entries=0)
+
+        with self.assertRaises(ValueError):
+            wcmatch.WcMatch(self.tempdir, '*.txt*', workers=2).step()
+
     def test_empty_string_dir(self):
         """Test when directory is an empty string."""
 
@@ -502,6 +795,399 @@ class TestWcmatch(_TestWcmatch):
         )
 
 
+class TestWcmatchEntries(_TestWcmatch):
+    """Test hooks with entries and filters on file size and modification time."""
+
+    def setUp(self):
+        """Setup."""
+
+        super().setUp()
+        self.mktemp('a', 'big.txt')
+        self.mktemp('old.txt')
+        self.mktemp('small.txt')
+        with open(self.norm('a', 'big.txt'), 'w') as f:
+            f.write('x' * 100)
+        with open(self.norm('small.txt'), 'w') as f:
+            f.write('x')
+        past = time.time() - 1000
+        os.utime(self.norm('old.txt'), (past, past))
+        self.flags = self.default_flags | wcmatch.RECURSIVE
+
+    def test_hook_entry(self):
+        """Test that hooks that accept the entry are given it."""
+
+        sizes = {}
+
+        class Walker(wcmatch.WcMatch):
+            def on_match(self, base, name, entry):
+                sizes[name] = entry.stat().st_size
+                return entry.path
+
+        for cache in (None, wcmatch.DirCache()):
+            sizes.clear()
+            results = Walker(self.tempdir, '*.txt', flags=self.flags, cache=cache).match()
+            self.assertEqual(sorted(results), self.norm_list(['a/big.txt', 'old.txt', 'small.txt']))
+            self.assertEqual(sizes, {'big.txt': 100, 'old.txt': 0, 'small.txt': 1})
+
+    def test_size(self):
+        """Test filtering by size."""
+
+        walker = wcmatch.WcMatch(self.tempdir, '*.txt', flags=self.flags, min_size=1)
+        self.crawl_files(walker)
+        self.assertEqual(sorted(self.files), self.norm_list(['a/big.txt', 'small.txt']))
+        self.assertEqual(self.skipped, 1)
+
+        self.files = []
+        walker = wcmatch.WcMatch(self.tempdir, '*.txt', flags=self.flags, min_size=1, max_size=10)
+        self.crawl_files(walker)
+        self.assertEqual(sorted(self.files), self.norm_list(['small.txt']))
+
+    def test_modified_after(self):
+        """Test filtering by modification time."""
+
+        walker = wcmatch.WcMatch(self.tempdir, '*.txt', flags=self.flags, modified_after=time.time() - 500)
+        self.crawl_files(walker)
+        self.assertEqual(sorted(self.files), self.norm_list(['a/big.txt', 'small.txt']))
+
+        with self.assertRaises(ValueError):
+            walker.rescan(TESTFN + '.state')
+
+
+class TestWcmatchRescan(_TestWcmatch):
+    """Test incremental searches."""
+
+    def setUp(self):
+        """Setup."""
+
+        super().setUp()
+        self.state = TESTFN + '.state'
+        self.mktemp('a', 'b', 'y.txt')
+        self.mktemp('a', 'x.txt')
+        self.mktemp('c', 'z.txt')
+        self.mktemp('w.txt')
+        self.mktemp('n.py')
+        self.backdate()
+
+    def tearDown(self):
+        """Cleanup."""
+
+        super().tearDown()
+        if os.path.exists(self.state):
+            os.remove(self.state)
+
+    def backdate(self):
+        """Backdate the folders so they aren't considered recently modified."""
+
+        past = time.time() - 100
+        for base, dirs, files in os.walk(self.tempdir):
+            os.utime(base, (past, past))
+
+    def rescan(self, **kwargs):
+        """Rescan, returning the changes and the number of folders that were scanned."""
+
+        walker = wcmatch.WcMatch(self.tempdir, '*.txt', flags=self.default_flags | wcmatch.RECURSIVE, **kwargs)
+        scan = walker._scandir
+        scanned = []
+
+        def counted(base):
+            scanned.append(base)
+            return scan(base)
+
+        walker._scandir = counted
+        added, removed = walker.rescan(self.state)
+        return sorted(added), sorted(removed), len(scanned)
+
+    def test_rescan(self):
+        """Test that only changes are reported."""
+
+        self.assertEqual(self.rescan(), (self.norm_list(['a/b/y.txt', 'a/x.txt', 'c/z.txt', 'w.txt']), [], 4))
+        self.assertEqual(self.rescan(), ([], [], 0))
+
+        self.mktemp('a', 'b', 'new.txt')
+        os.remove(self.norm('c', 'z.txt'))
+        self.assertEqual(self.rescan(), (self.norm_list(['a/b/new.txt']), self.norm_list(['c/z.txt']), 2))
+
+    def test_rescan_removed_folder(self):
+        """Test that the matches of removed folders are reported."""
+
+        self.rescan()
+        shutil.rmtree(self.norm('a'))
+        self.assertEqual(self.rescan(), ([], self.norm_list(['a/b/y.txt', 'a/x.txt']), 1))
+
+    def test_rescan_options_changed(self):
+        """Test that the state is not used if the patterns change."""
+
+        self.rescan()
+        self.assertEqual(self.rescan(exclude_pattern='a'), (self.norm_list(['c/z.txt', 'w.txt']), [], 2))
+
+    def test_rescan_bad_state(self):
+        """Test that a corrupt state is ignored."""
+
+        with open(self.state, 'wb') as f:
+            f.write(b'garbage')
+        self.assertEqual(self.rescan(), (self.norm_list(['a/b/y.txt', 'a/x.txt', 'c/z.txt', 'w.txt']), [], 4))
+
+
+class TestWcmatchCheckpoint(_TestWcmatch):
+    """Test resuming searches from checkpoints."""
+
+    def setUp(self):
+        """Setup."""
+
+        super().setUp()
+        self.checkpoint = TESTFN + '.checkpoint'
+        self.mktemp('a', 'b', 'y.txt')
+        self.mktemp('a', 'b', 'z.txt')
+        self.mktemp('a', 'x.txt')
+        self.mktemp('c', 'z.txt')
+        self.mktemp('v.txt')
+        self.mktemp('w.txt')
+        self.mktemp('n.py')
+        self.flags = self.default_flags | wcmatch.RECURSIVE
+        self.expected = self.norm_list(['a/b/y.txt', 'a/b/z.txt', 'a/x.txt', 'c/z.txt', 'v.txt', 'w.txt'])
+
+    def tearDown(self):
+        """Cleanup."""
+
+        super().tearDown()
+        if os.path.exists(self.checkpoint):
+            os.remove(self.checkpoint)
+
+    def test_resume(self):
+        """Test resuming at every point of the search."""
+
+        for stop in range(1, len(self.expected)):
+            walker = wcmatch.WcMatch(self.tempdir, '*.txt', flags=self.flags)
+            files = []
+            for f in walker.imatch():
+                files.append(f)
+                if len(files) == stop:
+                    walker.kill()
+            checkpoint = walker.get_checkpoint()
+
+            walker = wcmatch.WcMatch(self.tempdir, '*.txt', flags=self.flags, resume=checkpoint)
+            files.extend(walker.match())
+            self.assertEqual(sorted(files), self.expected)
+            self.assertEqual(walker.get_skipped(), 1)
+
+    def test_resume_truncated(self):
+        """Test resuming a search that ran out of budget."""
+
+        for max_entries in range(1, 12):
+            walker = wcmatch.WcMatch(self.tempdir, '*.txt', flags=self.flags, max_entries=max_entries)
+            files = walker.match()
+            walker = wcmatch.WcMatch(self.tempdir, '*.txt', flags=self.flags, resume=walker.get_checkpoint())
+            files.extend(walker.match())
+            self.assertEqual(sorted(files), self.expected)
+
+    def test_resume_subfolders(self):
+        """Test resuming with a budget smaller than the number of subfolders in a folder."""
+
+        for name in ('d', 'e', 'f'):
+            self.mktemp(name, 'x.txt')
+        expected = sorted(self.expected + self.norm_list(['d/x.txt', 'e/x.txt', 'f/x.txt']))
+
+        files = []
+        checkpoint = None
+        for _ in range(100):
+            walker = wcmatch.WcMatch(self.tempdir, '*.txt', flags=self.flags, max_entries=3, resume=checkpoint)
+            files.extend(walker.match())
+            if not walker.is_truncated():
+                break
+            checkpoint = walker.get_checkpoint()
+        else:
+            self.fail('Resumed search did not finish')
+        self.assertEqual(sorted(files), expected)
+
+    def test_checkpoint_symlinks(self):
+        """Test that following symlinks doesn't make checkpoints grow with every folder crawled."""
+
+        for i in range(20):
+            self.mktemp('d{:02d}'.format(i), 'x.txt')
+
+        overhead = []
+        for stop in (5, 25):
+            sizes = []
+            for flags in (self.flags | wcmatch.SYMLINKS, self.flags & ~wcmatch.SYMLINKS):
+                walker = wcmatch.WcMatch(self.tempdir, '*.txt', flags=flags)
+                for count, _ in enumerate(walker.imatch(), 1):
+                    if count == stop:
+                        walker.kill()
+                sizes.append(len(walker.get_checkpoint()))
+            overhead.append(sizes[0] - sizes[1])
+        # Only the folders left to crawl carry the folders above them, so the overhead shrinks with them.
+        self.assertLessEqual(overhead[1], overhead[0])
+
+    def test_checkpoint_file(self):
+        """Test that a checkpoint file is written when stopped and removed when done."""
+
+        walker = wcmatch.WcMatch(
+            self.tempdir, '*.txt', flags=self.flags, checkpoint_file=self.checkpoint, checkpoint_interval=1
+        )
+        files = []
+        for f in walker.imatch():
+            files.append(f)
+            if len(files) == 3:
+                break
+        self.assertTrue(os.path.exists(self.checkpoint))
+
+        walker = wcmatch.WcMatch(self.tempdir, '*.txt', flags=self.flags, checkpoint_file=self.checkpoint)
+        files.extend(walker.match())
+        self.assertEqual(sorted(files), self.expected)
+        self.assertFalse(os.path.exists(self.checkpoint))
+
+    def test_checkpoint_file_type(self):
+        """Test a checkpoint file whose type differs from the root directory's."""
+
+        mixed = ((os.fsencode(self.tempdir), self.checkpoint), (self.tempdir, os.fsencode(self.checkpoint)))
+        for root, checkpoint in mixed:
+            pattern = os.fsencode('*.txt') if isinstance(root, bytes) else '*.txt'
+            walker = wcmatch.WcMatch(root, pattern, flags=self.flags, checkpoint_file=checkpoint, checkpoint_interval=1)
+            files = []
+            for f in walker.imatch():
+                files.append(f)
+                if len(files) == 3:
+                    break
+            self.assertTrue(os.path.exists(self.checkpoint))
+
+            walker = wcmatch.WcMatch(root, pattern, flags=self.flags, checkpoint_file=checkpoint)
+            files.extend(walker.match())
+            self.assertEqual(sorted(os.fsdecode(f) for f in files), self.expected)
+            self.assertFalse(os.path.exists(self.checkpoint))
+
+    def test_checkpoint_bad(self):
+        """Test bad checkpoints."""
+
+        checkpoint = wcmatch.WcMatch(self.tempdir, '*.txt', flags=self.flags).get_checkpoint()
+        self.assertIsNone(checkpoint)
+
+        walker = wcmatch.WcMatch(self.tempdir, '*.txt', flags=self.flags)
+        walker.match()
+        checkpoint = walker.get_checkpoint()
+
+        with self.assertRaises(ValueError):
+            wcmatch.WcMatch(self.tempdir, '*.py', flags=self.flags, resume=checkpoint)
+
+        with self.assertRaises(ValueError):
+            wcmatch.WcMatch(self.tempdir, '*.txt', flags=self.flags, resume=b'garbage')
+
+        with self.assertRaises(ValueError):
+            wcmatch.WcMatch(self.tempdir, '*.txt', flags=self.flags, resume=checkpoint, min_size=1)
+
+        with self.assertRaises(ValueError):
+            wcmatch.WcMatch(self.tempdir, '*.txt', flags=self.flags, resume=checkpoint, workers=2)
+
+
+class TestWcmatchRoots(_TestWcmatch):
+    """Test searching multiple root directories."""
+
+    def setUp(self):
+        """Setup."""
+
+        super().setUp()
+        self.mktemp('one', 'a', 'x.txt')
+        self.mktemp('one', 'y.txt')
+        self.mktemp('one', 'z.py')
+        self.mktemp('two', 'b', 'x.txt')
+        self.mktemp('two', 'z.py')
+        self.roots = [self.norm('one'), self.norm('two')]
+        self.flags = self.default_flags | wcmatch.RECURSIVE
+        self.expected = [
+            (self.roots[0], self.norm('one', 'y.txt')),
+            (self.roots[0], self.norm('one', 'a', 'x.txt')),
+            (self.roots[1], self.norm('two', 'b', 'x.txt'))
+        ]
+        self.checkpoint = TESTFN + '.checkpoint'
+        self.state = TESTFN + '.state'
+
+    def tearDown(self):
+        """Cleanup."""
+
+        super().tearDown()
+        for name in (self.checkpoint, self.state):
+            if os.path.exists(name):
+                os.remove(name)
+
+    def test_roots(self):
+        """Test that results are tagged with their root, in the order of the roots."""
+
+        walker = wcmatch.WcMatch(self.roots, '*.txt', flags=self.flags)
+        self.assertEqual(walker.match(), self.expected)
+        self.assertEqual(walker.get_skipped(), 2)
+
+        walker = wcmatch.WcMatch(tuple(self.roots[:1]), '*.txt', flags=self.flags)
+        self.assertEqual(walker.match(), self.expected[:2])
+
+    def test_roots_concurrent(self):
+        """Test crawling multiple roots concurrently."""
+
+        walker = wcmatch.WcMatch(self.roots, '*.txt', flags=self.flags, workers=2)
+        self.assertEqual(walker.match(), self.expected)
+
+        walker = wcmatch.WcMatch(self.roots, '*.txt', flags=self.flags, workers=2, ordered=False)
+        self.assertEqual(sorted(walker.match()), sorted(self.expected))
+
+        walker = wcmatch.WcMatch(self.roots, '*.txt', flags=self.flags, processes=2)
+        self.assertEqual(sorted(walker.match()), sorted(self.expected))
+        self.assertEqual(walker.get_skipped(), 2)
+
+        async def crawl(walker):
+            return [f async for f in walker.aimatch()]
+
+        walker = wcmatch.WcMatch(self.roots, '*.txt', flags=self.flags, workers=2)
+        loop = asyncio.new_event_loop()
+        try:
+            self.assertEqual(loop.run_until_complete(crawl(walker)), self.expected)
+        finally:
+            loop.close()
+
+    def test_roots_limit(self):
+        """Test that limits are shared by all the roots."""
+
+        walker = wcmatch.WcMatch(self.roots, '*.txt', flags=self.flags, max_entries=3)
+        self.assertEqual(walker.match(), self.expected[:1])
+        self.assertTrue(walker.is_truncated())
+
+    def test_roots_resume(self):
+        """Test resuming a search of multiple roots."""
+
+        walker = wcmatch.WcMatch(self.roots, '*.txt', flags=self.flags)
+        files = []
+        for f in walker.imatch():
+            files.append(f)
+            walker.kill()
+
+        walker = wcmatch.WcMatch(self.roots, '*.txt', flags=self.flags, resume=walker.get_checkpoint())
+        files.extend(walker.match())
+        self.assertEqual(files, self.expected)
+
+        with self.assertRaises(ValueError):
+            wcmatch.WcMatch(self.roots[:1], '*.txt', flags=self.flags, resume=walker.get_checkpoint())
+
+    def test_roots_rescan(self):
+        """Test rescanning multiple roots."""
+
+        walker = wcmatch.WcMatch(self.roots, '*.txt', flags=self.flags)
+        added, removed = walker.rescan(self.state)
+        self.assertEqual(sorted(added), sorted(self.expected))
+        self.assertEqual(removed, [])
+
+        os.remove(self.norm('two', 'b', 'x.txt'))
+        self.mktemp('two', 'w.txt')
+        added, removed = walker.rescan(self.state)
+        self.assertEqual(added, [(self.roots[1], self.norm('two', 'w.txt'))])
+        self.assertEqual(removed, [(self.roots[1], self.norm('two', 'b', 'x.txt'))])
+
+    def test_roots_bad(self):
+        """Test bad roots."""
+
+        with self.assertRaises(ValueError):
+            wcmatch.WcMatch([], '*.txt')
+
+        with self.assertRaises(TypeError):
+            wcmatch.WcMatch([self.roots[0], os.fsencode(self.roots[1])], '*.txt')
+
+
 @skip_unless_symlink
 class TestWcmatchSymlink(_TestWcmatch):
     """Test symlinks."""
@@ -551,6 +1237,45 @@ class TestWcmatchSymlink(_TestWcmatch):
             )
         )
 
+    def test_symlinks_cache(self):
+        """Test symlinks with a directory cache."""
+
+        cache = wcmatch.DirCache()
+        for _ in range(2):
+            self.files = []
+            walker = wcmatch.WcMatch(
+                self.tempdir,
+                '*.txt',
+                flags=self.default_flags | wcmatch.RECURSIVE | wcmatch.HIDDEN | wcmatch.SYMLINKS,
+                cache=cache
+            )
+
+            self.crawl_files(walker)
+            self.assertEqual(
+                sorted(self.files),
+                self.norm_list(
+                    ['a.txt', '.hidden/a.txt', 'sym1/a.txt']
+                )
+            )
+
+    def test_avoid_symlinks_cache(self):
+        """Test avoiding symlinks with a directory cache."""
+
+        walker = wcmatch.WcMatch(
+            self.tempdir,
+            '*.txt',
+            flags=self.default_flags | wcmatch.RECURSIVE | wcmatch.HIDDEN,
+            cache=wcmatch.DirCache()
+        )
+
+        self.crawl_files(walker)
+        self.assertEqual(
+            sorted(self.files),
+            self.norm_list(
+                ['a.txt', '.hidden/a.txt']
+            )
+        )
+
     def test_avoid_symlinks(self):
         """Test avoiding symlinks."""
 
@@ -568,6 +1293,41 @@ class TestWcmatchSymlink(_TestWcmatch):
             )
         )
 
+    def test_symlink_loop(self):
+        """Test that symlinks back to a directory we are in are not followed."""
+
+        self.mksymlink('..', self.norm('.hidden', 'loop'))
+        flags = self.default_flags | wcmatch.RECURSIVE | wcmatch.HIDDEN | wcmatch.SYMLINKS
+        expected = self.norm_list(['a.txt', '.hidden/a.txt', 'sym1/a.txt'])
+
+        for options in ({}, {'workers': 2}, {'workers': 2, 'ordered': False}, {'processes': 2}):
+            walker = wcmatch.WcMatch(self.tempdir, '*.txt', flags=flags, **options)
+            self.assertEqual(sorted(walker.match()), expected)
+            # The loop is found once under `.hidden` and once under `sym1`.
+            self.assertEqual(walker.get_revisits(), 2)
+
+        walker = wcmatch.WcMatch(self.tempdir, '*.txt', flags=flags)
+        walker.kill()
+        walker.match()
+        walker.reset()
+        walker = wcmatch.WcMatch(self.tempdir, '*.txt', flags=flags, resume=walker.get_checkpoint())
+        self.assertEqual(sorted(walker.match()), expected)
+
+    def test_follow_once(self):
+        """Test that directories reached through symlinks are only crawled once with `follow_once`."""
+
+        self.mksymlink('..', self.norm('.hidden', 'loop'))
+        flags = self.default_flags | wcmatch.RECURSIVE | wcmatch.HIDDEN | wcmatch.SYMLINKS
+
+        walker = wcmatch.WcMatch(self.tempdir, '*.txt', flags=flags, follow_once=True)
+        files = walker.match()
+        self.assertEqual(len(files), 2)
+        self.assertIn(self.norm('a.txt'), files)
+        self.assertEqual(walker.get_revisits(), 2)
+
+        with self.assertRaises(ValueError):
+            wcmatch.WcMatch(self.tempdir, '*.txt', flags=flags, follow_once=True, processes=2)
+
 
 class TestExpansionLimit(unittest.TestCase):
     """Test expansion limits."""
@@ -189,5 +189,5 @@ def parse_version(ver):
     return Version(major, minor, micro, release, pre, post, dev)
 
 
-__version_info__ = Version(8, 2, 0, "final")
+__version_info__ = Version(8, 3, 0, "final")
 __version__ = __version_info__._get_canonical()
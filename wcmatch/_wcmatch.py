@@ -3,6 +3,9 @@ import re
 import os
 import stat
 import copyreg
+import threading
+import time
+from collections import OrderedDict
 from . import util
 
 # `O_DIRECTORY` may not always be defined
@@ -11,6 +14,213 @@ DIR_FLAGS = os.O_RDONLY | getattr(os, 'O_DIRECTORY', 0)
 SUPPORT_DIR_FD = {os.open, os.stat} <= os.supports_dir_fd and os.scandir in os.supports_fd
 
 
+# Listings of directories modified this close (in nanoseconds) to when they were scanned are not trusted,
+# as a change in the same timestamp tick would not change the directory's modification time.
+_RACY_NS = 2000000000
+
+
+class DirCache:
+    """
+    Cache directory listings across calls.
+
+    Listings are keyed by the directory's device and inode, so the same directory is shared
+    no matter what path or directory descriptor it is accessed with. Each time a listing is
+    requested, the directory is revalidated with a single `stat`: if its modification time
+    has changed, it is rescanned. The least recently used listings are evicted once the
+    total number of retained entries exceeds `max_entries`.
+
+    Symlinks are always resolved when read as their target can change without the directory
+    containing them changing.
+    """
+
+    def __init__(self, max_entries=100000):
+        """Initialize."""
+
+        if max_entries < 0:
+            raise ValueError("max_entries cannot be negative")
+        self.max_entries = max_entries
+        self._listings = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        """Get the number of cached directories."""
+
+        return len(self._listings)
+
+    def clear(self):
+        """Clear the cache."""
+
+        with self._lock:
+            self._listings.clear()
+            self._size = 0
+
+    def _scandir(self, path, dir_fd):
+        """Scan the directory and return a dictionary of `name: (is_dir, is_link)`."""
+
+        files = {}
+        fd = None
+        try:
+            if dir_fd is not None:
+                fd = os.open(path, DIR_FLAGS, dir_fd=dir_fd)
+            with os.scandir(path if fd is None else fd) as scan:
+                for f in scan:
+                    try:
+                        is_link = f.is_symlink()
+                        files[f.name] = (False if is_link else f.is_dir(), is_link)
+                    except OSError:  # pragma: no cover
+                        pass
+        finally:
+            if fd is not None:
+                os.close(fd)
+        return files
+
+    def _resolve(self, path, dir_fd, files):
+        """Resolve whether symlinks point to directories."""
+
+        resolved = None
+        for name, (is_dir, is_link) in files.items():
+            if not is_link:
+                continue
+            if resolved is None:
+                resolved = dict(files)
+            try:
+                is_dir = stat.S_ISDIR(os.stat(os.path.join(path, name), dir_fd=dir_fd).st_mode)
+            except (OSError, ValueError):
+                is_dir = False
+            resolved[name] = (is_dir, True)
+        return files if resolved is None else resolved
+
+    def _listdir(self, path, dir_fd=None):
+        """
+        Get the listing of a directory as a dictionary of `name: (is_dir, is_link)`.
+
+        The returned dictionary must not be modified. `OSError` is raised if the directory cannot be accessed.
+        """
+
+        st = os.stat(path, dir_fd=dir_fd)
+        key = (isinstance(path, bytes), st.st_dev, st.st_ino)
+
+        with self._lock:
+            cached = self._listings.get(key)
+            if cached is not None:
+                mtime, files = cached
+                if mtime == st.st_mtime_ns:
+                    self._listings.move_to_end(key)
+                    return self._resolve(path, dir_fd, files)
+
+        now = int(time.time() * 1e9)
+        files = self._scandir(path, dir_fd)
+
+        with self._lock:
+            cached = self._listings.pop(key, None)
+            if cached is not None:
+                self._size -= len(cached[1])
+            if now - st.st_mtime_ns >= _RACY_NS and len(files) <= self.max_entries:
+                self._listings[key] = (st.st_mtime_ns, files)
+                self._size += len(files)
+                while self._size > self.max_entries:
+                    self._size -= len(self._listings.popitem(last=False)[1][1])
+
+        return self._resolve(path, dir_fd, files)
+
+
+class PathEntry(object):
+    """
+    Minimal stand-in for `os.DirEntry`.
+
+    Used for paths that were not acquired via `scandir` (`.`, `..`, absolute literals, cached listings, etc.)
+    so that they can be checked the same way as paths that were.
+    """
+
+    def __init__(self, path, dir_fd=None):
+        """Initialize."""
+
+        self.name = os.path.basename(path)
+        self.path = path
+        self.dir_fd = dir_fd
+        self._stat = None
+        self._lstat = None
+
+    def stat(self, *, follow_symlinks=True):
+        """Get the stat result of the path."""
+
+        if follow_symlinks:
+            if self._stat is None:
+                self._stat = os.stat(self.path, dir_fd=self.dir_fd)
+            return self._stat
+        if self._lstat is None:
+            self._lstat = os.lstat(self.path, dir_fd=self.dir_fd)
+        return self._lstat
+
+    def is_dir(self):
+        """Check if path is a directory."""
+
+        try:
+            return stat.S_ISDIR(self.stat().st_mode)
+        except (OSError, ValueError):
+            return False
+
+    def is_file(self):
+        """Check if path is a file."""
+
+        try:
+            return stat.S_ISREG(self.stat().st_mode)
+        except (OSError, ValueError):
+            return False
+
+    def is_symlink(self):
+        """Check if path is a symlink."""
+
+        try:
+            return stat.S_ISLNK(self.stat(follow_symlinks=False).st_mode)
+        except (OSError, ValueError):
+            return False
+
+
+class Truncated(Exception):
+    """Raised internally when a scan budget is exhausted."""
+
+
+class ScanBudget:
+    """
+    Limit how long a file system crawl can take and how many directory entries it can examine.
+
+    The clock starts when the crawl starts, not when the budget is created.
+    """
+
+    __slots__ = ('seconds', 'deadline', 'remaining', 'exhausted')
+
+    def __init__(self, seconds=None, entries=None):
+        """Initialize."""
+
+        if seconds is not None and seconds < 0:
+            raise ValueError('deadline cannot be negative')
+        if entries is not None and entries < 0:
+            raise ValueError('max_entries cannot be negative')
+        self.seconds = seconds
+        self.deadline = None
+        self.remaining = entries
+        self.exhausted = False
+
+    def start(self):
+        """Start the clock if it has not already been started."""
+
+        if self.seconds is not None and self.deadline is None:
+            self.deadline = time.monotonic() + self.seconds
+
+    def spend(self, count=1):
+        """Spend part of the budget and return whether there is any budget left."""
+
+        if self.remaining is not None:
+            self.remaining -= count
+            if self.remaining < 0:
+                self.exhausted = True
+        if self.deadline is not None and time.monotonic() >= self.deadline:
+            self.exhausted = True
+        return not self.exhausted
+
+
 RE_WIN_MOUNT = (
     re.compile(r'\\|[a-z]:(?:\\|$)', re.I),
     re.compile(br'\\|[a-z]:(?:\\|$)', re.I)
@@ -24,7 +24,14 @@ import os
 import sys
 import re
 import functools
-from collections import namedtuple
+import copy
+import concurrent.futures
+import heapq
+import queue
+import threading
+import json
+import base64
+from collections import namedtuple, deque
 from . import _wcparse
 from . import _wcmatch
 from . import util
@@ -33,9 +40,10 @@ __all__ = (
     "CASE", "IGNORECASE", "RAWCHARS", "DOTGLOB", "DOTMATCH",
     "EXTGLOB", "EXTMATCH", "GLOBSTAR", "NEGATE", "MINUSNEGATE", "BRACE", "NOUNIQUE",
     "REALPATH", "FOLLOW", "MATCHBASE", "MARK", "NEGATEALL", "NODIR", "FORCEWIN", "FORCEUNIX", "GLOBTILDE",
-    "NODOTDIR", "SCANDOTDIR", "SUPPORT_DIR_FD",
+    "NODOTDIR", "SCANDOTDIR", "SUPPORT_DIR_FD", "DirCache",
     "C", "I", "R", "D", "E", "G", "N", "M", "B", "P", "L", "S", "X", 'K', "O", "A", "W", "U", "T", "Q", "Z", "SD",
-    "iglob", "glob", "globmatch", "globfilter", "escape", "raw_escape", "is_magic"
+    "iglob", "glob", "GlobIterator", "GlobResults", "first", "exists", "count", "page", "GlobPlan", "globmatch",
+    "globfilter", "escape", "raw_escape", "is_magic"
 )
 
 # We don't use `util.platform` only because we mock it in tests,
@@ -43,6 +51,7 @@ __all__ = (
 WIN = sys.platform.startswith('win')
 
 SUPPORT_DIR_FD = _wcmatch.SUPPORT_DIR_FD
+DirCache = _wcmatch.DirCache
 
 C = CASE = _wcparse.CASE
 I = IGNORECASE = _wcparse.IGNORECASE
@@ -102,6 +111,18 @@ FLAG_MASK = (
     _NOABSOLUTE
 )
 
+# Maximum number of directory descriptors to hold open at once when crawling relative to `dir_fd`.
+_DIR_FD_LIMIT = 64
+# Maximum number of directory entries retained by the per-run listing memo.
+_LISTING_LIMIT = 100000
+# Maximum number of results a root crawled by a worker can get ahead of the results being consumed.
+_ROOT_QUEUE_SIZE = 1000
+# Handed over by a worker once it is done with a root.
+_ROOT_DONE = object()
+
+# File types that may be requested via `types`.
+_FILE_TYPES = frozenset(('file', 'dir', 'symlink'))
+
 _RE_PATHLIB_DOT_NORM = [
     re.compile(r'(?:((?<=^)|(?<=/))\.(?:/|$))+'),
     re.compile(br'(?:((?<=^)|(?<=/))\.(?:/|$))+')
@@ -387,10 +408,18 @@ class _GlobSplit(object):
 class Glob(object):
     """Glob patterns."""
 
-    def __init__(self, pattern, flags=0, root_dir=None, dir_fd=None, limit=_wcparse.PATTERN_LIMIT):
+    def __init__(
+        self, pattern, flags=0, root_dir=None, dir_fd=None, limit=_wcparse.PATTERN_LIMIT,
+        types=None, min_size=None, max_size=None, newer_than=None, older_than=None,
+        max_depth=None, min_depth=0, follow_once=False, cache=None, sort=False, order='dfs', max_queue=10000,
+        deadline=None, max_entries=None, prune=None
+    ):
         """Initialize the directory walker object."""
 
-        self.seen = set()
+        self.seen = {}
+        self._dir_fds = {}
+        self._listings = None
+        self._listing_size = 0
         self.is_bytes = isinstance(pattern[0], bytes)
         self.current = b'.' if self.is_bytes else '.'
         self.dir_fd = dir_fd if SUPPORT_DIR_FD else None
@@ -429,6 +458,9 @@ class Glob(object):
         self.specials = (b'.', b'..') if self.is_bytes else ('.', '..')
         self.empty = b'' if self.is_bytes else ''
         self.stars = b'**' if self.is_bytes else '**'
+        self.path_seps = tuple(
+            os.fsencode(sep) if self.is_bytes else sep for sep in (os.sep, os.altsep) if sep is not None
+        )
         self.limit = limit
         if self.flags & FORCEWIN:
             self.sep = b'\\' if self.is_bytes else '\\'
@@ -441,6 +473,35 @@ class Glob(object):
             self.re_pathlib_norm = _RE_PATHLIB_DOT_NORM[util.BYTES if self.is_bytes else util.UNICODE]
             self.re_no_dir = _wcparse.RE_NO_DIR[util.BYTES if self.is_bytes else util.UNICODE]
         self._parse_patterns(pattern)
+        self._parse_predicates(types, min_size, max_size, newer_than, older_than)
+        if (max_depth is not None and max_depth < 0) or min_depth < 0:
+            raise ValueError('Depth limits cannot be negative')
+        if max_depth is not None and min_depth > max_depth:
+            raise ValueError('min_depth cannot be greater than max_depth')
+        self.max_depth = max_depth
+        self.min_depth = min_depth
+        self.follow_once = follow_once
+        self.cache = cache
+        self.sort = sort
+        self._cursor = None
+        if order not in ('dfs', 'bfs'):
+            raise ValueError("order must be 'dfs' or 'bfs', not {!r}".format(order))
+        self.bfs = order == 'bfs'
+        if self.bfs and sort:
+            raise ValueError('Breadth first order cannot be sorted')
+        if max_queue < 1:
+            raise ValueError('max_queue must be greater than 0')
+        self.max_queue = max_queue
+        self.deadline = deadline
+        self.max_entries = max_entries
+        self._budget = self._new_budget()
+        self.prune = prune
+        self._re_sep = re.compile(b'|'.join(re.escape(sep) for sep in self.path_seps)) if self.is_bytes else \
+            re.compile('|'.join(re.escape(sep) for sep in self.path_seps))
+        self._check_root_type()
+
+    def _check_root_type(self):
+        """Check that the root directory is the same type as the patterns."""
 
         if (
             (self.is_bytes and not isinstance(self.root_dir, bytes)) or
@@ -448,10 +509,38 @@ class Glob(object):
         ):
             raise TypeError(
                 'Pattern and root_dir should be of the same type, not {} and {}'.format(
-                    type(pattern[0]), type(self.root_dir)
+                    type(self.current), type(self.root_dir)
                 )
             )
 
+    def _new_budget(self):
+        """Create the scan budget for a run, or `None` if the run is not limited."""
+
+        if self.deadline is None and self.max_entries is None:
+            return None
+        return _wcmatch.ScanBudget(self.deadline, self.max_entries)
+
+    def _new_run(self, root_dir=None, dir_fd=None, cache=None, budget=None):
+        """
+        Create a copy of the glob object to run against the given root.
+
+        The copy shares the parsed patterns and options, which are not modified while globbing,
+        but gets its own run state, so multiple copies can be run at the same time.
+        A scan budget can be provided to share it with other runs.
+        """
+
+        run = copy.copy(self)
+        run.seen = {}
+        run._dir_fds = {}
+        run._listings = None
+        run._listing_size = 0
+        run.dir_fd = dir_fd if SUPPORT_DIR_FD else None
+        run.root_dir = os.fspath(root_dir) if root_dir is not None else self.current
+        run.cache = cache
+        run._budget = budget if budget is not None else self._new_budget()
+        run._check_root_type()
+        return run
+
     def _iter_patterns(self, patterns):
         """Iterate expanded patterns."""
 
@@ -509,16 +598,108 @@ class Glob(object):
         if self.nodir:
             self.npatterns.append(self.re_no_dir)
 
-        # A single positive pattern will not find multiples of the same file
-        # disable unique mode so that we won't waste time or memory computing unique returns.
+        # A single positive pattern will not find multiples of the same file, nor will patterns
+        # that we can prove yield disjoint results. Disable unique mode so that we won't waste time
+        # or memory computing unique returns.
         if (
-            len(self.pattern) <= 1 and
-            not self.flags & NODOTDIR and
             not self.nounique and
-            not (self.pathlib and self.scandotdir)
+            not (self.pathlib and self.scandotdir) and
+            ((len(self.pattern) <= 1 and not self.flags & NODOTDIR) or self._is_disjoint())
         ):
             self.nounique = True
 
+    def _is_disjoint(self):
+        """
+        Check if the patterns are guaranteed to yield disjoint results.
+
+        A pattern with more than one `globstar` can match the same path in more than one way
+        (`**/*/**`), so each pattern may have at most one. Across patterns, we compare the literal
+        directories that each pattern starts with: if no pattern's literal prefix is the same as,
+        or the start of, another pattern's literal prefix, no two patterns can return the same path.
+        """
+
+        prefixes = []
+        for pattern in self.pattern:
+            if sum(1 for part in pattern if part.is_globstar) > 1:
+                return False
+
+            prefix = []
+            for part in pattern:
+                if part.is_magic:
+                    break
+                # `pathlib` normalizes out `.`, so don't try to reason about them.
+                if part.pattern in self.specials and len(self.pattern) > 1:
+                    return False
+                prefix.append(part.pattern if self.case_sensitive else part.pattern.lower())
+            prefixes.append(tuple(prefix))
+
+        # Sorted, a prefix will always be directly followed by a path it is the start of.
+        prefixes.sort()
+        for a, b in zip(prefixes, prefixes[1:]):
+            if b[:len(a)] == a:
+                return False
+        return True
+
+    def _parse_predicates(self, types, min_size, max_size, newer_than, older_than):
+        """Parse file type, size, and time predicates."""
+
+        self.types = frozenset(util.to_tuple(types)) if types is not None else None
+        if self.types is not None and not self.types <= _FILE_TYPES:
+            raise ValueError(
+                'Unknown file type(s): {}'.format(', '.join(sorted(str(t) for t in self.types - _FILE_TYPES)))
+            )
+        self.min_size = min_size
+        self.max_size = max_size
+        self.newer_than = newer_than
+        self.older_than = older_than
+        # Only call `stat` if a predicate actually needs it.
+        self.needs_stat = any(p is not None for p in (min_size, max_size, newer_than, older_than))
+        self.has_predicates = self.types is not None or self.needs_stat
+
+    def _match_predicates(self, curdir, name, entry):
+        """
+        Check if the entry satisfies the file type, size, and time predicates.
+
+        `DirEntry` objects cache file type information (and stat results once requested),
+        so we evaluate against the entry directly. Paths not acquired via `scandir` are
+        checked through a light weight wrapper.
+        """
+
+        if entry is None:
+            entry = _wcmatch.PathEntry(*self._get_path_and_fd(os.path.join(curdir, name) if curdir else name))
+
+        try:
+            if self.types is not None:
+                if not (
+                    ('symlink' in self.types and entry.is_symlink()) or
+                    ('dir' in self.types and entry.is_dir()) or
+                    ('file' in self.types and entry.is_file())
+                ):
+                    return False
+
+            if self.needs_stat:
+                st = entry.stat()
+                if self.min_size is not None and st.st_size < self.min_size:
+                    return False
+                if self.max_size is not None and st.st_size > self.max_size:
+                    return False
+                if self.newer_than is not None and st.st_mtime <= self.newer_than:
+                    return False
+                if self.older_than is not None and st.st_mtime >= self.older_than:
+                    return False
+        except (OSError, ValueError):
+            return False
+
+        return True
+
+    def _is_pruned(self, curdir, name, entry):
+        """Check if the `prune` callback wants to skip descending into a directory."""
+
+        path = os.path.join(curdir, name)
+        if entry is None:
+            entry = _wcmatch.PathEntry(*self._get_path_and_fd(path))
+        return bool(self.prune(path, entry))
+
     def _is_hidden(self, name):
         """Check if is file hidden."""
 
@@ -581,7 +762,8 @@ class Glob(object):
         if not self.dir_fd:
             return os.path.lexists(self.prepend_base(path))
         try:
-            os.lstat(self.prepend_base(path), dir_fd=self.dir_fd)
+            path, dir_fd = self._get_path_and_fd(path)
+            os.lstat(path, dir_fd=dir_fd)
         except (OSError, ValueError):  # pragma: no cover
             return False
         else:
@@ -595,65 +777,343 @@ class Glob(object):
         else:
             return os.path.join(self.root_dir, path)
 
-    def _iter(self, curdir, dir_only, deep):
-        """Iterate the directory."""
+    def _get_path_and_fd(self, path):
+        """
+        Get the path and the directory descriptor it should be accessed relative to.
 
-        try:
-            fd = None
-            if self.is_abs_pattern and curdir:
-                scandir = curdir
-            elif self.dir_fd is not None:
-                fd = scandir = os.open(
-                    os.path.join(self.root_dir, curdir) if curdir else self.root_dir,
-                    _wcmatch.DIR_FLAGS,
-                    dir_fd=self.dir_fd
-                )
-            else:
-                scandir = os.path.join(self.root_dir, curdir) if curdir else self.root_dir
+        When `dir_fd` is used, we access the path relative to its parent's descriptor if the
+        parent is still open. This keeps the kernel from resolving the entire path from the
+        root for every directory, and isn't affected by concurrent renames further up the tree.
+        """
+
+        if self.is_abs_pattern or self.dir_fd is None:
+            return self.prepend_base(path), self.dir_fd
+
+        if not path:
+            fd = self._dir_fds.get(self.empty)
+            if fd is not None:
+                return self.current, fd
+        else:
+            parent, name = os.path.split(path)
+            fd = self._dir_fds.get(parent)
+            if fd is not None and name:
+                return name, fd
+
+        return (os.path.join(self.root_dir, path) if path else self.root_dir), self.dir_fd
+
+    def _open_dir(self, curdir):
+        """Open a directory descriptor."""
 
-            # Python will never return . or .., so fake it.
-            for special in self.specials:
-                yield special, True, True, False
+        path, dir_fd = self._get_path_and_fd(curdir)
+        return os.open(path, _wcmatch.DIR_FLAGS, dir_fd=dir_fd)
+
+    def _hold_dir(self, curdir, fd):
+        """
+        Keep a directory descriptor open while its children are crawled.
+
+        If we are at our limit, or the directory is already held, the caller should close it.
+        """
+
+        if curdir in self._dir_fds or len(self._dir_fds) >= _DIR_FD_LIMIT:
+            return False
+        self._dir_fds[curdir] = fd
+        return True
+
+    def _release_dir(self, curdir):
+        """Close a held directory descriptor."""
+
+        os.close(self._dir_fds.pop(curdir))
+
+    def _get_listing_key(self, curdir):
+        """Get the key a directory's listing is memoized under."""
+
+        return self.is_abs_pattern, curdir or self.empty
+
+    def _is_listed(self, curdir):
+        """Check if a directory's listing is already memoized."""
+
+        return self._listings is not None and self._get_listing_key(curdir) in self._listings
+
+    def _memoize_listing(self, key, files):
+        """
+        Memoize a directory listing.
 
+        Once we've hit our limit, we stop retaining new listings, and those directories are just rescanned if needed.
+        """
+
+        size = self._listing_size + len(files)
+        if size <= _LISTING_LIMIT:
+            self._listings[key] = files
+            self._listing_size = size
+
+    def _scandir(self, curdir, fd=None):
+        """
+        Scan the directory.
+
+        Returns `None` if the directory could not be opened.
+
+        If a directory descriptor is given, the directory will be scanned with it,
+        but the caller is responsible for closing it, and must not do so while the
+        `DirEntry` objects are still in use, as they access the file system through it.
+        If we open the descriptor ourselves, it is closed right away, so the entries
+        are dropped.
+        """
+
+        if self.cache is not None:
+            return self._scan_cache(curdir, fd)
+
+        files = []
+        close = False
+        if fd is not None:
+            scandir = fd
+        elif self.is_abs_pattern and curdir:
+            scandir = curdir
+        elif self.dir_fd is not None:
+            try:
+                fd = scandir = self._open_dir(curdir)
+            except OSError:  # pragma: no cover
+                return None
+            close = True
+        else:
+            scandir = os.path.join(self.root_dir, curdir) if curdir else self.root_dir
+
+        try:
             try:
                 with os.scandir(scandir) as scan:
                     for f in scan:
                         try:
-                            hidden = self._is_hidden(f.name)
                             is_dir = f.is_dir()
-                            if is_dir:
-                                is_link = f.is_symlink()
-                            else:
-                                # We don't care if a file is a link
-                                is_link = False
-                            if (not dir_only or is_dir):
-                                yield f.name, is_dir, hidden, is_link
+                            # We don't care if a file is a link
+                            is_link = f.is_symlink() if is_dir else False
+                            files.append((f.name, is_dir, self._is_hidden(f.name), is_link, None if close else f))
                         except OSError:  # pragma: no cover
                             pass
             finally:
-                if fd is not None:
+                if close:
                     os.close(fd)
 
         except OSError:  # pragma: no cover
             pass
+        return files
 
-    def _glob_dir(self, curdir, matcher, dir_only=False, deep=False):
-        """Recursive directory glob."""
+    def _scan_cache(self, curdir, fd=None):
+        """
+        Get the directory listing from the cache.
 
-        files = list(self._iter(curdir, dir_only, deep))
-        for file, is_dir, hidden, is_link in files:
-            if file in self.specials:
-                if matcher is not None and matcher(file):
-                    yield os.path.join(curdir, file), True
-                continue
+        Cached listings don't carry a `DirEntry`, so anything needing `stat` will request it directly.
+        """
 
-            path = os.path.join(curdir, file)
-            follow = not is_link or self.follow_links
-            if (matcher is None and not hidden and (follow or not deep)) or (matcher and matcher(file)):
-                yield path, is_dir
+        if fd is not None:
+            path, dir_fd = self.current, fd
+        elif self.is_abs_pattern and curdir:
+            path, dir_fd = curdir, None
+        else:
+            path, dir_fd = self._get_path_and_fd(curdir or self.empty)
 
-            if deep and not hidden and is_dir and follow:
-                yield from self._glob_dir(path, matcher, dir_only, deep)
+        try:
+            listing = self.cache._listdir(path, dir_fd)
+        except (OSError, ValueError):  # pragma: no cover
+            return None
+
+        # We don't care if a file is a link
+        return [
+            (name, is_dir, self._is_hidden(name), is_link and is_dir, None)
+            for name, (is_dir, is_link) in listing.items()
+        ]
+
+    def _iter(self, curdir, dir_only, deep, fd=None):
+        """
+        Iterate the directory.
+
+        When there are multiple patterns, the same directory can be visited more than once in a run,
+        so listings are memoized for the duration of the run.
+        """
+
+        if self._budget is not None and not self._budget.spend(0):
+            raise _wcmatch.Truncated
+
+        files = None
+        if self._listings is not None:
+            key = self._get_listing_key(curdir)
+            files = self._listings.get(key)
+        if files is None:
+            files = self._scandir(curdir, fd)
+            if files is None:
+                return
+            if self._listings is not None:
+                if self.dir_fd is not None and not self.is_abs_pattern:
+                    # The descriptor the entries were scanned with may be closed by the time we use them again.
+                    self._memoize_listing(key, [file[:4] + (None,) for file in files])
+                else:
+                    self._memoize_listing(key, files)
+
+        # Python will never return . or .., so fake it.
+        for special in self.specials:
+            yield special, True, True, False, None
+
+        budget = self._budget
+        for file in files:
+            if budget is not None and not budget.spend():
+                raise _wcmatch.Truncated
+            if not dir_only or file[1]:
+                yield file
+
+    def _get_dir_id(self, path, entry=None):
+        """
+        Get the device and inode of a directory (following symlinks).
+
+        `DirEntry` caches the stat result, but on Windows, `DirEntry.stat` does not provide
+        the device and inode, so we must call `stat` on the path in that case. We also
+        fall back to the path if the entry can't be stat'ed.
+        """
+
+        st = None
+        if entry is not None:
+            try:
+                st = entry.stat()
+            except OSError:
+                pass
+        try:
+            if st is None or not st.st_ino:
+                st = _wcmatch.PathEntry(*self._get_path_and_fd(path)).stat()
+        except (OSError, ValueError):
+            return None
+        return st.st_dev, st.st_ino
+
+    def _glob_dir_bfs(self, curdir, matcher, dir_only, last):
+        """
+        Breadth first directory glob.
+
+        Directories to descend into are queued instead of being crawled right away. If the queue
+        is full, the directory is crawled depth first instead.
+        """
+
+        queue = deque()
+        yield from self._glob_dir(curdir, matcher, dir_only, True, last, queue=queue)
+        while queue:
+            path, depth, visited = queue.popleft()
+            yield from self._glob_dir(path, matcher, dir_only, True, last, depth, visited, queue)
+
+    def _glob_dir(self, curdir, matcher, dir_only=False, deep=False, last=False, depth=0, visited=None, queue=None):
+        """
+        Recursive directory glob.
+
+        If `last` is set, the matches are final results, so they are also checked
+        against the stat predicates (if any) before we bother building a path.
+
+        When searching deep, `depth` is how many directory levels below the `globstar`'s
+        starting directory we are. Names in a directory at `depth` are matched by `**`
+        against `depth` levels, or `depth + 1` levels if `**` is at the end of the pattern.
+
+        When following symlinks in a deep search, `visited` tracks the device and inode of
+        the directories we've entered along the current path (or the entire crawl if `follow_once`
+        is enabled) so that symlink loops are not followed endlessly.
+
+        When searching breadth first, directories to descend into are added to `queue`.
+
+        If there is a `prune` callback, it is asked before descending into any directory,
+        whether to crawl it deeper, or to feed it to the next part of the pattern.
+        """
+
+        if deep and self.follow_links and visited is None:
+            visited = set()
+            key = self._get_dir_id(curdir)
+            if key is not None:
+                visited.add(key)
+
+        predicates = last and self.has_predicates
+        if deep:
+            level = depth if matcher is not None else depth + 1
+            in_range = level >= self.min_depth and (self.max_depth is None or level <= self.max_depth)
+            descend = self.max_depth is None or level < self.max_depth
+        else:
+            in_range = True
+            descend = False
+
+        fd = None
+        held = close = False
+        if (
+            self.dir_fd is not None and self.cache is None and not self.is_abs_pattern and
+            (deep or not last) and not self._is_listed(curdir)
+        ):
+            # We will likely crawl into sub-directories, so keep the descriptor open
+            # while we do so that the sub-directories can be opened relative to it.
+            # The entries we scan with it are only usable while it is open, so even
+            # if we can't hold it, it is not closed until we are done with them.
+            # If the directory is already held, we just scan it with the held descriptor.
+            fd = self._dir_fds.get(curdir)
+            if fd is None:
+                try:
+                    fd = self._open_dir(curdir)
+                except (OSError, ValueError):  # pragma: no cover
+                    return
+                held = self._hold_dir(curdir, fd)
+                close = not held
+
+        try:
+            files = list(self._iter(curdir, dir_only, deep, fd))
+            if self.sort:
+                files.sort(key=lambda f: f[0])
+
+            for file, is_dir, hidden, is_link, entry in files:
+                if file in self.specials:
+                    if (
+                        in_range and matcher is not None and matcher(file) and
+                        (not predicates or self._match_predicates(curdir, file, entry))
+                    ):
+                        yield os.path.join(curdir, file), True
+                    continue
+
+                follow = not is_link or self.follow_links
+                pruned = None
+                if (
+                    in_range and
+                    ((matcher is None and not hidden and (follow or not deep)) or (matcher and matcher(file))) and
+                    (not predicates or self._match_predicates(curdir, file, entry))
+                ):
+                    # If this isn't the last part of the pattern, we will be descending into the match.
+                    if not last and self.prune is not None:
+                        pruned = self._is_pruned(curdir, file, entry)
+                    if not pruned:
+                        yield os.path.join(curdir, file), is_dir
+
+                if descend and not hidden and is_dir and follow:
+                    path = os.path.join(curdir, file)
+                    if self._cursor is not None and self._is_before_cursor(path):
+                        continue
+
+                    if self.prune is not None:
+                        if pruned is None:
+                            pruned = self._is_pruned(curdir, file, entry)
+                        if pruned:
+                            continue
+
+                    key = None
+                    if visited is not None:
+                        key = self._get_dir_id(path, entry)
+                        if key is None or key in visited:
+                            continue
+
+                    if queue is not None and len(queue) < self.max_queue:
+                        # Queued directories need their own copy of the directories along their path.
+                        if key is not None and self.follow_once:
+                            visited.add(key)
+                        queue.append((path, depth + 1, visited if key is None or self.follow_once else visited | {key}))
+                        continue
+
+                    if key is None:
+                        yield from self._glob_dir(path, matcher, dir_only, deep, last, depth + 1)
+                        continue
+
+                    visited.add(key)
+                    yield from self._glob_dir(path, matcher, dir_only, deep, last, depth + 1, visited)
+                    if not self.follow_once:
+                        visited.discard(key)
+        finally:
+            if held:
+                self._release_dir(curdir)
+            elif close:
+                os.close(fd)
 
     def _glob(self, curdir, this, rest):
         """
@@ -669,6 +1129,9 @@ class Glob(object):
         - `globstar` `**`.
         """
 
+        if self._cursor is not None and curdir and self._is_before_cursor(curdir):
+            return
+
         is_magic = this.is_magic
         dir_only = this.dir_only
         target = this.pattern
@@ -704,32 +1167,68 @@ class Glob(object):
             # return already, so this isn't needed in that case.
             # There is one quirk though with Bash, if `curdir` had magic before `**`, Bash
             # omits the trailing `/`. We don't worry about that.
-            if globstar_end and curdir:
+            if (
+                globstar_end and curdir and self.min_depth == 0 and
+                (not self.has_predicates or self._match_predicates(None, curdir, None))
+            ):
                 yield os.path.join(curdir, self.empty), True
 
             # Search
-            for path, is_dir in self._glob_dir(curdir, matcher, dir_only, deep=True):
-                if this:
-                    yield from self._glob(path, this, rest[:])
-                else:
-                    yield path, is_dir
+            if self.bfs:
+                matches = self._glob_dir_bfs(curdir, matcher, dir_only, last=this is None)
+            else:
+                matches = self._glob_dir(curdir, matcher, dir_only, deep=True, last=this is None)
+            if this and self.sort:
+                yield from self._merge_deep(matches, lambda path: self._glob(path, this, rest[:]))
+            else:
+                for path, is_dir in matches:
+                    if this:
+                        yield from self._glob(path, this, rest[:])
+                    else:
+                        yield path, is_dir
 
         elif not dir_only:
             # Files: no need to recursively search at this point as we are done.
             matcher = self._get_matcher(target)
-            yield from self._glob_dir(curdir, matcher)
+            yield from self._glob_dir(curdir, matcher, last=True)
 
         else:
             # Directory: search current directory against pattern
             # and feed the results back through with the next pattern.
             this = rest.pop(0) if rest else None
             matcher = self._get_matcher(target)
-            for path, is_dir in self._glob_dir(curdir, matcher, True):
+            for path, is_dir in self._glob_dir(curdir, matcher, True, last=this is None):
                 if this:
                     yield from self._glob(path, this, rest[:])
                 else:
                     yield path, is_dir
 
+    def _merge_deep(self, matches, expand):
+        """
+        Merge the results of expanding `globstar` matches in sorted order.
+
+        Matches arrive in sorted order, and everything a match expands to sorts after the match,
+        but the expansion of a match can sort after matches found deeper within it. So we only
+        expand matches as they come, and only yield a result when no match that has yet to be
+        expanded could produce something that sorts before it.
+        """
+
+        heap = []
+        count = 0
+        match = next(matches, None)
+        while match is not None or heap:
+            if heap and (match is None or heap[0][0] < self._sort_key(match[0])):
+                key, _, result, results = heapq.heappop(heap)
+                yield result
+            else:
+                results = expand(match[0])
+                match = next(matches, None)
+
+            result = next(results, None)
+            if result is not None:
+                heapq.heappush(heap, (self._sort_key(result[0]), count, result, results))
+                count += 1
+
     def _get_starting_paths(self, curdir, dir_only):
         """
         Get the starting location.
@@ -744,24 +1243,43 @@ class Glob(object):
             results = []
             matcher = self._get_matcher(curdir)
             files = list(self._iter(None, dir_only, False))
-            for file, is_dir, hidden, is_link in files:
+            for file, is_dir, hidden, is_link, entry in files:
                 if file not in self.specials and (matcher is None or matcher(file)):
-                    results.append((file, is_dir))
+                    results.append((file, is_dir, entry))
+            if self.sort:
+                results.sort(key=lambda r: r[0])
         else:
-            results = [(curdir, True)]
+            results = [(curdir, True, None)]
         return results
 
     def is_unique(self, path):
-        """Test if path is unique."""
+        """
+        Test if path is unique.
+
+        Instead of retaining every full path, names are stored in a set per parent directory,
+        so each directory path is only retained once no matter how many results it has.
+        """
 
         if self.nounique:
             return True
 
-        unique = False
-        if (path.lower() if not self.case_sensitive else path) not in self.seen:
-            self.seen.add(path)
-            unique = True
-        return unique
+        if not util.is_case_sensitive():
+            # Only compare case insensitively when the file system is, as the results are real paths.
+            path = path.lower()
+
+        # Split after the last separator so that the parts always join back to the original path.
+        index = max(path.rfind(sep) for sep in self.path_seps) + 1
+        parent = path[:index]
+        name = path[index:]
+
+        names = self.seen.get(parent)
+        if names is None:
+            self.seen[parent] = {name}
+        elif name in names:
+            return False
+        else:
+            names.add(name)
+        return True
 
     def _pathlib_norm(self, path):
         """Normalize path as `pathlib` does."""
@@ -776,12 +1294,122 @@ class Glob(object):
         if self.is_unique(self._pathlib_norm(path) if self.pathlib else path):
             yield path
 
-    def glob(self):
-        """Starts off the glob iterator."""
+    def _iter_matches(self):
+        """
+        Find matches.
+
+        Yields raw matches that have passed exclusion checks, but have not been formatted,
+        nor checked for uniqueness: `(path, is_dir, dir_only)`. If the scan budget runs out,
+        the search just stops.
+        """
+
+        self.is_abs_pattern = False
+        if self._budget is not None:
+            self._budget.start()
+        if len(self.pattern) > 1:
+            self._listings = {}
+            self._listing_size = 0
+
+        if self.dir_fd is not None:
+            # Hold the root directory open for the entire run so everything can be opened relative to it.
+            try:
+                fd = self._open_dir(self.empty)
+            except (OSError, ValueError):  # pragma: no cover
+                pass
+            else:
+                self._hold_dir(self.empty, fd)
+
+        try:
+            if not self.sort:
+                yield from self._iter_pattern_matches()
+            else:
+                yield from self._iter_sorted_matches()
+        except _wcmatch.Truncated:
+            pass
+        finally:
+            self._listings = None
+            if self.empty in self._dir_fds:
+                self._release_dir(self.empty)
+
+    def _iter_sorted_matches(self):
+        """
+        Find matches for each pattern and merge them in sorted order.
+
+        Each pattern's matches are already sorted, but as the patterns are searched at the same time,
+        each pattern is searched with its own copy of the glob object as some state is tracked per pattern.
+        If we are resuming from a cursor, filter out anything before the cursor.
+        """
+
+        if len(self.pattern) > 1:
+            runs = []
+            for pattern in self.pattern:
+                run = copy.copy(self)
+                run.pattern = [pattern]
+                runs.append(run._iter_pattern_matches())
+            matches = heapq.merge(*runs, key=lambda m: self._sort_key(m[0]))
+        else:
+            matches = self._iter_pattern_matches()
+
+        if self._cursor is None:
+            yield from matches
+        else:
+            for match in matches:
+                if self._group_key(match[0]) >= self._cursor:
+                    yield match
+
+    def _sort_key(self, path):
+        """Get the key to sort a path by: its path components."""
 
-        curdir = self.current
+        return tuple(self._re_sep.split(path)) if path else ()
+
+    def _is_before_cursor(self, path):
+        """Check if the path, and everything under it, sorts before the cursor."""
+
+        key = self._sort_key(path)
+        return key < self._cursor and key != self._cursor[:len(key)]
+
+    def _group_key(self, path):
+        """
+        Get the key results are grouped by when sorted.
+
+        Trailing separators are ignored as `path` and `path/` sort right next to each other.
+        """
+
+        key = self._sort_key(path)
+        while key and not key[-1]:
+            key = key[:-1]
+        return key
+
+    def _encode_cursor(self, key, seen):
+        """Encode the last sort key and the results returned for it as a cursor."""
+
+        if self.is_bytes:
+            key = [os.fsdecode(part) for part in key]
+            seen = [os.fsdecode(path) for path in seen]
+        cursor = {'key': list(key), 'seen': sorted(seen)}
+        return base64.urlsafe_b64encode(json.dumps(cursor).encode('ascii')).decode('ascii')
+
+    def _decode_cursor(self, cursor):
+        """Decode a cursor to the last sort key and the results returned for it."""
+
+        try:
+            cursor = json.loads(base64.urlsafe_b64decode(cursor).decode('ascii'))
+            key = cursor['key']
+            seen = cursor['seen']
+            if not all(isinstance(item, str) for item in key + seen):
+                raise ValueError
+        except (ValueError, TypeError, KeyError):
+            raise ValueError('Invalid cursor') from None
+        if self.is_bytes:
+            return tuple(os.fsencode(part) for part in key), {os.fsencode(path) for path in seen}
+        return tuple(key), set(seen)
+
+    def _iter_pattern_matches(self):
+        """Find matches for each pattern."""
 
         for pattern in self.pattern:
+            # Each pattern starts from the current directory, not where the last one left off.
+            curdir = self.current
             # If the pattern ends with `/` we return the files ending with `/`.
             dir_only = pattern[-1].dir_only if pattern else False
             self.is_abs_pattern = pattern[0].is_drive if pattern else False
@@ -806,39 +1434,362 @@ class Glob(object):
 
                     if this.dir_only:
                         # Glob these directories if they exists
-                        for start, is_dir in results:
+                        for start, is_dir, entry in results:
                             rest = pattern[1:]
                             if rest:
                                 this = rest.pop(0)
                                 for match, is_dir in self._glob(start, this, rest):
                                     if not self._is_excluded(match, is_dir):
-                                        yield from self.format_path(match, is_dir, dir_only)
-                            elif not self._is_excluded(start, is_dir):
-                                yield from self.format_path(start, is_dir, dir_only)
+                                        yield match, is_dir, dir_only
+                            elif (
+                                not self._is_excluded(start, is_dir) and
+                                (not self.has_predicates or self._match_predicates(None, start, entry))
+                            ):
+                                yield start, is_dir, dir_only
                     else:
                         # Return the file(s) and finish.
-                        for match, is_dir in results:
-                            if self._lexists(match) and not self._is_excluded(match, is_dir):
-                                yield from self.format_path(match, is_dir, dir_only)
+                        for match, is_dir, entry in results:
+                            if (
+                                self._lexists(match) and not self._is_excluded(match, is_dir) and
+                                (not self.has_predicates or self._match_predicates(None, match, entry))
+                            ):
+                                yield match, is_dir, dir_only
                 else:
                     # Path starts with a magic pattern, let's get globbing
                     rest = pattern[:]
                     this = rest.pop(0)
                     for match, is_dir in self._glob(curdir if not curdir == self.current else self.empty, this, rest):
                         if not self._is_excluded(match, is_dir):
-                            yield from self.format_path(match, is_dir, dir_only)
+                            yield match, is_dir, dir_only
 
+    def glob(self):
+        """Starts off the glob iterator."""
 
-def iglob(patterns, *, flags=0, root_dir=None, dir_fd=None, limit=_wcparse.PATTERN_LIMIT):
-    """Glob."""
+        if self.sort and not self.nounique and util.is_case_sensitive() and not self.pathlib:
+            yield from self._glob_sorted()
+            return
 
-    yield from Glob(util.to_tuple(patterns), flags, root_dir, dir_fd, limit).glob()
+        for path, is_dir, dir_only in self._iter_matches():
+            yield from self.format_path(path, is_dir, dir_only)
 
+    def _glob_sorted(self):
+        """
+        Glob in sorted order only tracking unique results for the current path.
 
-def glob(patterns, *, flags=0, root_dir=None, dir_fd=None, limit=_wcparse.PATTERN_LIMIT):
+        When sorted, duplicates are always next to each other, so we don't need to remember
+        every result, just the results for the current path.
+        """
+
+        group = None
+        seen = set()
+        for path, is_dir, dir_only in self._iter_matches():
+            key = self._group_key(path)
+            if key != group:
+                group = key
+                seen.clear()
+            path = os.path.join(path, self.empty) if dir_only or (self.mark and is_dir) else path
+            if path not in seen:
+                seen.add(path)
+                yield path
+
+    def first(self):
+        """Return the first match and stop searching."""
+
+        matches = self._iter_matches()
+        try:
+            for path, is_dir, dir_only in matches:
+                # The first result is always unique, so just format it.
+                return os.path.join(path, self.empty) if dir_only or (self.mark and is_dir) else path
+            return None
+        finally:
+            matches.close()
+
+    def exists(self):
+        """Check if there is at least one match and stop searching on the first."""
+
+        matches = self._iter_matches()
+        try:
+            for _ in matches:
+                return True
+            return False
+        finally:
+            matches.close()
+
+    def page(self, page_size, cursor=None):
+        """
+        Return a page of results and a cursor for the next page.
+
+        The cursor is `None` if there are no more results. If the scan budget runs out,
+        the page may be short, but a cursor is still returned to continue from where it stopped.
+        """
+
+        if page_size < 1:
+            raise ValueError('page_size must be greater than 0')
+        if self.bfs:
+            raise ValueError('Breadth first order cannot be paged')
+        if self.flags & NOUNIQUE or self.follow_once:
+            # Neither the duplicates already returned, nor the directories already crawled, fit in a cursor.
+            raise ValueError('NOUNIQUE and follow_once cannot be paged')
+
+        self.sort = True
+        group = None
+        seen = set()
+        if cursor is not None:
+            # Results with the same key as the last result of the previous page may still need to be returned.
+            group, seen = self._decode_cursor(cursor)
+            self._cursor = group
+
+        results = []
+        matches = self._iter_matches()
+        try:
+            for path, is_dir, dir_only in matches:
+                key = self._group_key(path)
+                if key != group:
+                    group = key
+                    seen = set()
+                for result in self.format_path(path, is_dir, dir_only):
+                    # Compare results the same way `is_unique` does.
+                    unique = result if util.is_case_sensitive() else result.lower()
+                    if unique in seen:
+                        continue
+                    if len(results) == page_size:
+                        return results, self._encode_cursor(group, seen)
+                    seen.add(unique)
+                    results.append(result)
+            if self._budget is not None and self._budget.exhausted:
+                if not results:
+                    # The cursor only moves with the results, so the next call would stop in the same place.
+                    raise ValueError('deadline or max_entries ran out before a result past the cursor was found')
+                # We ran out of time or entries, so return what we have and resume from here.
+                return results, self._encode_cursor(group, seen)
+            return results, None
+        finally:
+            matches.close()
+
+    def count(self):
+        """Count the matches without retaining the results."""
+
+        if self.nounique:
+            # No need to format the paths if we don't need to compare them.
+            return sum(1 for _ in self._iter_matches())
+
+        return sum(1 for match in self._iter_matches() for _ in self.format_path(*match))
+
+
+class GlobIterator(object):
+    """
+    Iterator of glob results.
+
+    If a `deadline` or `max_entries` limit stopped the crawl early, `truncated` will be `True`.
+    """
+
+    __slots__ = ('_results', '_budget')
+
+    def __init__(self, results, budget=None):
+        """Initialize."""
+
+        self._results = results
+        self._budget = budget
+
+    def __iter__(self):
+        """Iterate the results."""
+
+        return self
+
+    def __next__(self):
+        """Get the next result."""
+
+        return next(self._results)
+
+    def close(self):
+        """Stop searching."""
+
+        self._results.close()
+
+    @property
+    def truncated(self):
+        """Whether the results were cut short by a `deadline` or `max_entries` limit."""
+
+        return self._budget is not None and self._budget.exhausted
+
+
+class GlobResults(list):
+    """
+    List of glob results.
+
+    If a `deadline` or `max_entries` limit stopped the crawl early, `truncated` will be `True`.
+    """
+
+    truncated = False
+
+
+def _glob_root(run, results, stop):
+    """Glob a root in a worker thread, handing the results over through a queue until we are told to stop."""
+
+    matches = run.glob()
+    try:
+        for path in matches:
+            results.put(path)
+            if stop.is_set():
+                break
+    finally:
+        matches.close()
+        if not stop.is_set():
+            results.put(_ROOT_DONE)
+
+
+def _iglob_roots(obj, root_dirs, dir_fd, cache, workers):
+    """
+    Glob multiple roots yielding `(root, path)`.
+
+    The patterns are only parsed once, and each root gets its own run of the glob object.
+    With `workers`, roots are crawled concurrently, but results are still yielded in the
+    order of the roots. Each root hands its results over through a bounded queue, so the
+    results of a root are yielded as they are found, and roots further down the line only
+    get so far ahead. All roots share the same scan budget.
+    """
+
+    if isinstance(root_dirs, (str, bytes, os.PathLike)):
+        root_dirs = (root_dirs,)
+
+    if not workers:
+        for root in root_dirs:
+            for path in obj._new_run(root, dir_fd, cache, obj._budget).glob():
+                yield root, path
+        return
+
+    stop = threading.Event()
+    with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+        runs = []
+        for root in root_dirs:
+            results = queue.Queue(_ROOT_QUEUE_SIZE)
+            run = obj._new_run(root, dir_fd, cache, obj._budget)
+            runs.append((root, results, executor.submit(_glob_root, run, results, stop)))
+        try:
+            for root, results, future in runs:
+                path = results.get()
+                while path is not _ROOT_DONE:
+                    yield root, path
+                    path = results.get()
+                # Raise any error the worker ran into.
+                future.result()
+        finally:
+            # If we were stopped early, don't bother crawling the remaining roots, and make room
+            # for any worker waiting to hand over a result so it will see that we've stopped.
+            stop.set()
+            for _, results, future in runs:
+                future.cancel()
+                while not results.empty():
+                    results.get_nowait()
+
+
+def iglob(
+    patterns, *, flags=0, root_dir=None, dir_fd=None, limit=_wcparse.PATTERN_LIMIT,
+    types=None, min_size=None, max_size=None, newer_than=None, older_than=None,
+    max_depth=None, min_depth=0, follow_once=False, cache=None, root_dirs=None, workers=None, sort=False,
+    order='dfs', max_queue=10000, deadline=None, max_entries=None, prune=None
+):
+    """Glob and return an iterator of the results."""
+
+    if root_dirs is not None and root_dir is not None:
+        raise ValueError('root_dir and root_dirs cannot be used together')
+    if workers is not None and workers < 1:
+        raise ValueError('workers must be greater than 0')
+
+    obj = Glob(
+        util.to_tuple(patterns), flags, root_dir, dir_fd, limit,
+        types=types, min_size=min_size, max_size=max_size, newer_than=newer_than, older_than=older_than,
+        max_depth=max_depth, min_depth=min_depth, follow_once=follow_once, cache=cache, sort=sort,
+        order=order, max_queue=max_queue, deadline=deadline, max_entries=max_entries, prune=prune
+    )
+
+    results = _iglob_roots(obj, root_dirs, dir_fd, cache, workers) if root_dirs is not None else obj.glob()
+    # Only wrap the results when there is a chance they could be truncated.
+    return results if obj._budget is None else GlobIterator(results, obj._budget)
+
+
+def glob(
+    patterns, *, flags=0, root_dir=None, dir_fd=None, limit=_wcparse.PATTERN_LIMIT,
+    types=None, min_size=None, max_size=None, newer_than=None, older_than=None,
+    max_depth=None, min_depth=0, follow_once=False, cache=None, root_dirs=None, workers=None, sort=False,
+    order='dfs', max_queue=10000, deadline=None, max_entries=None, prune=None
+):
     """Glob."""
 
-    return list(iglob(patterns, flags=flags, root_dir=root_dir, dir_fd=dir_fd, limit=limit))
+    results = iglob(
+        patterns, flags=flags, root_dir=root_dir, dir_fd=dir_fd, limit=limit,
+        types=types, min_size=min_size, max_size=max_size, newer_than=newer_than, older_than=older_than,
+        max_depth=max_depth, min_depth=min_depth, follow_once=follow_once, cache=cache,
+        root_dirs=root_dirs, workers=workers, sort=sort, order=order, max_queue=max_queue,
+        deadline=deadline, max_entries=max_entries, prune=prune
+    )
+    if not isinstance(results, GlobIterator):
+        return list(results)
+
+    # Keep whether the results were truncated, as the iterator won't be around to ask.
+    matches = GlobResults(results)
+    matches.truncated = results.truncated
+    return matches
+
+
+def first(patterns, *, flags=0, root_dir=None, dir_fd=None, limit=_wcparse.PATTERN_LIMIT, **kwargs):
+    """Return the first match, or `None`."""
+
+    return Glob(util.to_tuple(patterns), flags, root_dir, dir_fd, limit, **kwargs).first()
+
+
+def exists(patterns, *, flags=0, root_dir=None, dir_fd=None, limit=_wcparse.PATTERN_LIMIT, **kwargs):
+    """Check if anything matches."""
+
+    return Glob(util.to_tuple(patterns), flags, root_dir, dir_fd, limit, **kwargs).exists()
+
+
+def count(patterns, *, flags=0, root_dir=None, dir_fd=None, limit=_wcparse.PATTERN_LIMIT, **kwargs):
+    """Count matches."""
+
+    return Glob(util.to_tuple(patterns), flags, root_dir, dir_fd, limit, **kwargs).count()
+
+
+class GlobPlan(util.Immutable):
+    """
+    Glob patterns that are parsed once and can be run repeatedly.
+
+    Each run keeps its own state, so a plan can be run against any number of roots,
+    even from multiple threads at the same time.
+    """
+
+    __slots__ = ('_glob',)
+
+    def __init__(
+        self, patterns, *, flags=0, limit=_wcparse.PATTERN_LIMIT,
+        types=None, min_size=None, max_size=None, newer_than=None, older_than=None,
+        max_depth=None, min_depth=0, follow_once=False, sort=False, order='dfs', max_queue=10000,
+        deadline=None, max_entries=None, prune=None
+    ):
+        """Initialize."""
+
+        super(GlobPlan, self).__init__(
+            _glob=Glob(
+                util.to_tuple(patterns), flags, None, None, limit,
+                types=types, min_size=min_size, max_size=max_size, newer_than=newer_than, older_than=older_than,
+                max_depth=max_depth, min_depth=min_depth, follow_once=follow_once, sort=sort,
+                order=order, max_queue=max_queue, deadline=deadline, max_entries=max_entries, prune=prune
+            )
+        )
+
+    def run(self, root_dir=None, dir_fd=None, cache=None):
+        """Glob the given root and return an iterator of the results."""
+
+        run = self._glob._new_run(root_dir, dir_fd, cache)
+        return run.glob() if run._budget is None else GlobIterator(run.glob(), run._budget)
+
+
+def page(
+    patterns, *, page_size=100, cursor=None, flags=0, root_dir=None, dir_fd=None, limit=_wcparse.PATTERN_LIMIT, **kwargs
+):
+    """Get a page of sorted results and a cursor for the next page, or `None` if there are no more."""
+
+    return Glob(util.to_tuple(patterns), flags, root_dir, dir_fd, limit, **kwargs).page(page_size, cursor)
 
 
 def translate(patterns, *, flags=0, limit=_wcparse.PATTERN_LIMIT):
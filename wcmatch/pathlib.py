@@ -88,7 +88,7 @@ class Path(pathlib.Path):
             self._init()
         return self
 
-    def glob(self, patterns, *, flags=0, limit=_wcparse.PATTERN_LIMIT):
+    def glob(self, patterns, *, flags=0, limit=_wcparse.PATTERN_LIMIT, max_depth=None, min_depth=0):
         """
         Search the file system.
 
@@ -99,10 +99,12 @@ class Path(pathlib.Path):
         if self.is_dir():
             scandotdir = flags & SCANDOTDIR
             flags = self._translate_flags(flags | _NOABSOLUTE) | ((_PATHLIB | SCANDOTDIR) if scandotdir else _PATHLIB)
-            for filename in glob.iglob(patterns, flags=flags, root_dir=str(self), limit=limit):
+            for filename in glob.iglob(
+                patterns, flags=flags, root_dir=str(self), limit=limit, max_depth=max_depth, min_depth=min_depth
+            ):
                 yield self.joinpath(filename)
 
-    def rglob(self, patterns, *, flags=0, limit=_wcparse.PATTERN_LIMIT):
+    def rglob(self, patterns, *, flags=0, limit=_wcparse.PATTERN_LIMIT, max_depth=None, min_depth=0):
         """
         Recursive glob.
 
@@ -113,7 +115,9 @@ class Path(pathlib.Path):
 
         """
 
-        yield from self.glob(patterns, flags=flags | _EXTMATCHBASE, limit=limit)
+        yield from self.glob(
+            patterns, flags=flags | _EXTMATCHBASE, limit=limit, max_depth=max_depth, min_depth=min_depth
+        )
 
 
 class PurePath(pathlib.PurePath):
@@ -205,22 +205,26 @@ class Immutable(object):
         raise AttributeError('Class is immutable!')
 
 
-def is_hidden(path):
-    """Check if file is hidden."""
+def is_hidden(path, entry=None):
+    """
+    Check if file is hidden.
+
+    If the path's `os.DirEntry` is provided, its (possibly already cached) stat information is used.
+    """
 
     hidden = False
-    f = os.path.basename(path)
+    f = entry.name if entry is not None else os.path.basename(path)
     if f[:1] in ('.', b'.'):
         # Count dot file as hidden on all systems
         hidden = True
     elif _PLATFORM == 'windows':
         # On Windows, look for `FILE_ATTRIBUTE_HIDDEN`
         FILE_ATTRIBUTE_HIDDEN = 0x2
-        results = os.lstat(path)
+        results = entry.stat(follow_symlinks=False) if entry is not None else os.lstat(path)
         hidden = bool(results.st_file_attributes & FILE_ATTRIBUTE_HIDDEN)
     elif _PLATFORM == "osx":  # pragma: no cover
         # On macOS, look for `UF_HIDDEN`
-        results = os.lstat(path)
+        results = entry.stat(follow_symlinks=False) if entry is not None else os.lstat(path)
         hidden = bool(results.st_flags & stat.UF_HIDDEN)
     return hidden
 
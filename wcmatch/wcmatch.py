@@ -22,7 +22,17 @@ IN THE SOFTWARE.
 """
 import os
 import re
+import copy
+import inspect
+import marshal
+import pickle
+import time
+import uuid
+import asyncio
+import concurrent.futures
+from collections import namedtuple
 from . import _wcparse
+from . import _wcmatch
 from . import util
 
 __all__ = (
@@ -30,7 +40,7 @@ __all__ = (
     "EXTMATCH", "GLOBSTAR", "BRACE", "MINUSNEGATE", "SYMLINKS", "HIDDEN", "RECURSIVE",
     "MATCHBASE",
     "C", "I", "R", "P", "E", "G", "M", "DP", "FP", "SL", "HD", "RV", "X", "B",
-    "WcMatch"
+    "WcMatch", "DirCache", "StepResult"
 )
 
 C = CASE = _wcparse.CASE
@@ -42,6 +52,8 @@ B = BRACE = _wcparse.BRACE
 M = MINUSNEGATE = _wcparse.MINUSNEGATE
 X = MATCHBASE = _wcparse.MATCHBASE
 
+DirCache = _wcmatch.DirCache
+
 # Control `PATHNAME` individually for folder exclude and files
 DP = DIRPATHNAME = 0x1000000
 FP = FILEPATHNAME = 0x2000000
@@ -78,6 +90,42 @@ FLAG_MASK = (
 )
 
 
+# The number of entries a worker process will crawl before handing the rest of its directories back as new work.
+_SHARD_SIZE = 10000
+
+# Hooks that can be given the entry of the file or folder.
+_ENTRY_HOOKS = ('on_validate_file', 'on_validate_directory', 'on_skip', 'on_error', 'on_match')
+
+# Bump if the format of the state saved by `rescan` changes.
+_STATE_VERSION = 1
+
+# Bump if the format of checkpoints changes.
+_CHECKPOINT_VERSION = 1
+
+# Yielded by the walk when a step has used up its budget.
+_PAUSE = object()
+
+# The walker most recently sent to this worker process, so that it is only unpickled once per search.
+_shard_walker = [None, None]
+
+
+def _walk_shard(token, payload, base, rel, index, ancestors):
+    """Crawl a unit of work in a worker process."""
+
+    if _shard_walker[0] != token:
+        _shard_walker[:] = [token, pickle.loads(payload)]
+    return _shard_walker[1]._walk_unit(base, rel, index, ancestors)
+
+
+class StepResult(namedtuple('StepResult', ['results', 'dirs_done', 'dirs_queued', 'skipped', 'finished'])):
+    """
+    The results of a `WcMatch.step`, and the progress of the search so far.
+
+    `dirs_done` is the number of directories crawled, `dirs_queued` the number of directories left to crawl
+    (that we know of), and `finished` whether the search is done.
+    """
+
+
 class _Mixin:  # pragma: no cover
     """
     DO NOT USE: Provide temporary methods to allow temporary, backwards compatibility for Rummage.
@@ -134,16 +182,72 @@ class _Mixin:  # pragma: no cover
 class WcMatch(_Mixin):
     """Finds files by wildcard."""
 
-    def __init__(self, root_dir, file_pattern=None, exclude_pattern=None, flags=0, limit=_wcparse.PATHNAME, **kwargs):
+    def __init__(
+        self, root_dir, file_pattern=None, exclude_pattern=None, flags=0, limit=_wcparse.PATHNAME, cache=None,
+        deadline=None, max_entries=None, workers=None, ordered=True, processes=None,
+        resume=None, checkpoint_file=None, checkpoint_interval=100,
+        min_size=None, max_size=None, modified_after=None, follow_once=False, **kwargs
+    ):
         """Initialize the directory walker object."""
 
-        self.is_bytes = isinstance(root_dir, bytes)
+        if workers is not None and workers < 1:
+            raise ValueError('workers must be greater than 0')
+        if processes is not None:
+            if processes < 1:
+                raise ValueError('processes must be greater than 0')
+            if workers is not None:
+                raise ValueError('workers and processes cannot be used together')
+            if cache is not None:
+                raise ValueError('cache cannot be used with processes')
+            if follow_once:
+                raise ValueError('follow_once cannot be used with processes')
+        if (resume is not None or checkpoint_file is not None) and (workers is not None or processes is not None):
+            raise ValueError('Checkpoints cannot be used with workers or processes')
+        if checkpoint_interval < 1:
+            raise ValueError('checkpoint_interval must be greater than 0')
+
+        # A list of roots are crawled together, with results tagged with the root they came from.
+        self._multi_root = isinstance(root_dir, (list, tuple))
+        roots = tuple(root_dir) if self._multi_root else (root_dir,)
+        if not roots:
+            raise ValueError('At least one root directory is required')
+        self.is_bytes = isinstance(roots[0], bytes)
+        if any(isinstance(root, bytes) != self.is_bytes for root in roots):
+            raise TypeError('Root directories must all be of type str or all be of type bytes')
+        self.cache = cache
+        self.deadline = deadline
+        self.max_entries = max_entries
+        self._budget = self._new_budget()
+        self.workers = workers
+        self.ordered = ordered
+        self.processes = processes
+        self.checkpoint_file = os.fspath(checkpoint_file) if checkpoint_file is not None else None
+        self.checkpoint_interval = checkpoint_interval
+        self.min_size = min_size
+        self.max_size = max_size
+        self.modified_after = modified_after
+        self.follow_once = follow_once
+        # Only call `stat` if a filter actually needs it.
+        self._needs_stat = any(f is not None for f in (min_size, max_size, modified_after))
+        self._stack = None
+        self._current = None
+        self._dirs_done = 0
+        self._visited = None
+        self._revisits = 0
+        self._step_budget = None
+        self._stepper = None
         self._abort = False
+        self._truncated = False
         self._skipped = 0
         self._parse_flags(flags)
-        self._directory = self._norm_slash(root_dir)
         self._sep = os.fsencode(os.sep) if self.is_bytes else os.sep
-        self._root_dir = self._add_sep(self._get_cwd(), True)
+        self._roots = roots
+        self._root_dirs = []
+        for root in roots:
+            self._directory = self._norm_slash(root)
+            self._root_dirs.append(self._add_sep(self._get_cwd(), True))
+        self._root_dirs = tuple(self._root_dirs)
+        self._root_dir = self._root_dirs[0]
         self.limit = limit
         self.pattern_file = file_pattern if file_pattern else self._directory[0:0]
         self.pattern_folder_exclude = exclude_pattern if exclude_pattern else self._directory[0:0]
@@ -151,6 +255,19 @@ class WcMatch(_Mixin):
         self.folder_exclude_check = None
         self.on_init(**kwargs)
         self._compile(self.pattern_file, self.pattern_folder_exclude)
+        # Only give the entry to hooks that have been overridden and accept it.
+        self._entry_hooks = frozenset(
+            hook for hook in _ENTRY_HOOKS
+            if getattr(type(self), hook) is not getattr(WcMatch, hook) and self._accepts_entry(getattr(self, hook))
+        )
+
+        if resume is None and self.checkpoint_file is not None:
+            try:
+                with open(self.checkpoint_file, 'rb') as f:
+                    resume = f.read()
+            except FileNotFoundError:
+                pass
+        self._resume = self._load_checkpoint(resume) if resume is not None else None
 
     def _norm_slash(self, name):
         """Normalize path slashes."""
@@ -218,43 +335,82 @@ class WcMatch(_Mixin):
             else:
                 self.folder_exclude_check = self._compile_wildcard(folder_exclude_pattern, self.dir_pathname)
 
-    def _valid_file(self, base, name):
-        """Return whether a file can be searched."""
+    def _is_hidden(self, base, name, entry):
+        """Check if a file or folder is hidden, using the `DirEntry` if we have one."""
+
+        return util.is_hidden(entry.path if entry is not None else os.path.join(base, name), entry)
+
+    @staticmethod
+    def _accepts_entry(hook):
+        """Check if a hook accepts the `entry` of the file or folder, as hooks written for older versions won't."""
+
+        try:
+            parameters = inspect.signature(hook).parameters.values()
+        except (TypeError, ValueError):  # pragma: no cover
+            return False
+        return any(p.name == 'entry' or p.kind == inspect.Parameter.VAR_KEYWORD for p in parameters)
+
+    def _hook(self, hook, base, name, entry):
+        """Call a hook, giving it the entry if it accepts it."""
+
+        if hook.__name__ not in self._entry_hooks:
+            return hook(base, name)
+        if entry is None:
+            entry = _wcmatch.PathEntry(os.path.join(base, name))
+        return hook(base, name, entry=entry)
+
+    def _match_stat(self, base, name, entry):
+        """Check the file's size and modification time against the filters."""
+
+        try:
+            st = entry.stat() if entry is not None else os.stat(os.path.join(base, name))
+        except OSError:
+            return False
+        if self.min_size is not None and st.st_size < self.min_size:
+            return False
+        if self.max_size is not None and st.st_size > self.max_size:
+            return False
+        if self.modified_after is not None and st.st_mtime <= self.modified_after:
+            return False
+        return True
+
+    def _valid_file(self, base, name, path, entry=None):
+        """Return whether a file can be searched, `path` being relative to the root directory."""
 
         valid = False
-        fullpath = os.path.join(base, name)
-        if self.file_check is not None and self.compare_file(fullpath[self._base_len:] if self.file_pathname else name):
+        if self.file_check is not None and self.compare_file(path if self.file_pathname else name):
             valid = True
-        if valid and (not self.show_hidden and util.is_hidden(fullpath)):
+        if valid and (not self.show_hidden and self._is_hidden(base, name, entry)):
+            valid = False
+        if valid and self._needs_stat and not self._match_stat(base, name, entry):
             valid = False
-        return self.on_validate_file(base, name) if valid else valid
+        return self._hook(self.on_validate_file, base, name, entry) if valid else valid
 
     def compare_file(self, filename):
         """Compare filename."""
 
         return self.file_check.match(filename)
 
-    def on_validate_file(self, base, name):
+    def on_validate_file(self, base, name, entry=None):
         """Validate file override."""
 
         return True
 
-    def _valid_folder(self, base, name):
-        """Return whether a folder can be searched."""
+    def _valid_folder(self, base, name, path, entry=None):
+        """Return whether a folder can be searched, `path` being relative to the root directory."""
 
         valid = True
-        fullpath = os.path.join(base, name)
         if (
             not self.recursive or
             (
                 len(self.folder_exclude_check) and
-                not self.compare_directory(fullpath[self._base_len:] if self.dir_pathname else name)
+                not self.compare_directory(path if self.dir_pathname else name)
             )
         ):
             valid = False
-        if valid and (not self.show_hidden and util.is_hidden(fullpath)):
+        if valid and (not self.show_hidden and self._is_hidden(base, name, entry)):
             valid = False
-        return self.on_validate_directory(base, name) if valid else valid
+        return self._hook(self.on_validate_directory, base, name, entry) if valid else valid
 
     def compare_directory(self, directory):
         """Compare folder."""
@@ -264,22 +420,22 @@ class WcMatch(_Mixin):
     def on_init(self, **kwargs):
         """Handle custom initialization."""
 
-    def on_validate_directory(self, base, name):
+    def on_validate_directory(self, base, name, entry=None):
         """Validate folder override."""
 
         return True
 
-    def on_skip(self, base, name):
+    def on_skip(self, base, name, entry=None):
         """On skip."""
 
         return None
 
-    def on_error(self, base, name):
+    def on_error(self, base, name, entry=None):
         """On error."""
 
         return None
 
-    def on_match(self, base, name):
+    def on_match(self, base, name, entry=None):
         """On match."""
 
         return os.path.join(base, name)
@@ -287,11 +443,75 @@ class WcMatch(_Mixin):
     def on_reset(self):
         """On reset."""
 
+    def _new_budget(self):
+        """Create the scan budget for a walk, or `None` if the walk is not limited."""
+
+        if self.deadline is None and self.max_entries is None:
+            return None
+        return _wcmatch.ScanBudget(self.deadline, self.max_entries)
+
+    def is_truncated(self):
+        """Check if the last walk was cut short by `deadline` or `max_entries`."""
+
+        return self._truncated
+
     def get_skipped(self):
         """Get number of skipped files."""
 
         return self._skipped
 
+    def get_revisits(self):
+        """Get number of directories that were not crawled again when reached through symlinks."""
+
+        return self._revisits
+
+    def _reset_visited(self):
+        """
+        Start tracking the directories we crawl, which is only needed if we follow symlinks.
+
+        With `follow_once`, we track the device and inode of every directory crawled, otherwise,
+        each folder left to crawl carries the device and inode of the directories above it.
+        """
+
+        self._visited = set() if self.follow_links and self.follow_once else None
+        self._revisits = 0
+
+    def _add_ancestor(self, key, ancestors):
+        """Get the ancestors to give the child folders of a directory, which includes the directory itself."""
+
+        if ancestors is None or key is None:
+            return ancestors
+        return ancestors | {key}
+
+    def _get_dir_id(self, path):
+        """Get the device and inode of a directory (following symlinks), or `None` if we can't."""
+
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        return st.st_dev, st.st_ino
+
+    def _is_revisit(self, key, ancestors):
+        """
+        Check if a directory should not be crawled, noting it as crawled if it should.
+
+        With `follow_once`, any directory already crawled is skipped, otherwise, only directories
+        above the one we are entering, given by `ancestors`, are, as crawling those again would loop forever.
+        """
+
+        if key is None:
+            return False
+        if self._visited is not None:
+            revisit = key in self._visited
+            if not revisit:
+                self._visited.add(key)
+        else:
+            revisit = ancestors is not None and key in ancestors
+        if revisit:
+            self._revisits += 1
+        return revisit
+
     def kill(self):
         """Abort process."""
 
@@ -307,61 +527,770 @@ class WcMatch(_Mixin):
 
         self._abort = False
 
-    def _walk(self):
-        """Start search for valid files."""
+    def _root_stack(self):
+        """
+        Get the stack of directories to start a crawl with, with the first root on top.
 
-        self._base_len = len(self._root_dir)
+        Each directory is `(path, rel, index, ancestors)` where `ancestors` is the set of devices and inodes
+        of the directories above it, or `None` if we don't need to check for symlink loops that way.
+        """
 
-        for base, dirs, files in os.walk(self._root_dir, followlinks=self.follow_links):
-            if self.is_aborted():
+        ancestors = frozenset() if self.follow_links and not self.follow_once else None
+        return [(root, root[0:0], index, ancestors) for index, root in reversed(list(enumerate(self._root_dirs)))]
+
+    def _scandir(self, base):
+        """
+        List a directory, splitting the entries into folders and files.
+
+        Entries are `(name, entry)` where `entry` is the `DirEntry`, or `None` if the listing came from the cache.
+        Folders also note whether they are symlinks that we should not follow.
+        """
+
+        dirs = []
+        files = []
+
+        if self.cache is not None:
+            for name, (is_dir, is_link) in self.cache._listdir(base).items():
+                if is_dir:
+                    dirs.append((name, None, is_link and not self.follow_links))
+                else:
+                    files.append((name, None))
+            return dirs, files
+
+        with os.scandir(base) as scan:
+            for entry in scan:
+                try:
+                    is_dir = entry.is_dir()
+                except OSError:  # pragma: no cover
+                    is_dir = False
+
+                if is_dir:
+                    try:
+                        is_link = not self.follow_links and entry.is_symlink()
+                    except OSError:  # pragma: no cover
+                        is_link = False
+                    dirs.append((entry.name, entry, is_link))
+                else:
+                    files.append((entry.name, entry))
+        return dirs, files
+
+    def _scan_worker(self, base):
+        """
+        Scan a directory from a worker thread, unless we've been aborted.
+
+        Returns the directory's device and inode (if we are tracking them) and its listing.
+        """
+
+        if self._abort:
+            return None
+        return self._get_dir_id(base) if self.follow_links else None, self._scandir(base)
+
+    def _walk_listing(self, base, rel, index, listing, descend, matched=None, done=None):
+        """
+        Check the entries of a directory listing, yielding results.
+
+        `index` is the index of the root the directory is under, and with multiple roots, results
+        are yielded as `(root, result)`. Child folders that should be crawled are added to `descend`
+        as `(path, rel, index)`, and if `matched` is given, the names of matching files are added to it.
+        If `done` is given, folders and files in it are skipped, and their names are added to it as they
+        are handled. If we run out of budget, the listing is abandoned and the walk is marked as truncated.
+        If we run out of budget for a step, `_PAUSE` is yielded, and we pick up where we left off.
+        """
+
+        budget = self._budget
+        step = self._step_budget
+        dirs, files = listing
+        root = self._roots[index] if self._multi_root else None
+
+        # Only descend into child folders that pass the exclude rules
+        for name, entry, is_link in dirs:
+            if done is not None and name in done:
+                continue
+
+            if budget is not None and not budget.spend():
+                self._truncated = True
+                return
+
+            if step is not None and not step.spend():
+                yield _PAUSE
+                step = self._step_budget
+                step.spend()
+
+            if done is not None:
+                done.add(name)
+
+            try:
+                if self._valid_folder(base, name, rel + name, entry) and not is_link:
+                    descend.append(
+                        (entry.path if entry is not None else os.path.join(base, name), rel + name + self._sep, index)
+                    )
+            except Exception:
+                value = self._hook(self.on_error, base, name, entry)
+                if value is not None:  # pragma: no cover
+                    yield (root, value) if self._multi_root else value
+
+            if self.is_aborted():  # pragma: no cover
                 break
 
-            # Remove child folders based on exclude rules
-            for name in dirs[:]:
+        # Search files if they were found
+        if files:
+            # Only search files that are in the include rules
+            for name, entry in files:
+                if done is not None and name in done:
+                    continue
+
+                if budget is not None and not budget.spend():
+                    self._truncated = True
+                    return
+
+                if step is not None and not step.spend():
+                    yield _PAUSE
+                    step = self._step_budget
+                    step.spend()
+
+                if done is not None:
+                    done.add(name)
+
                 try:
-                    if not self._valid_folder(base, name):
-                        dirs.remove(name)
+                    valid = self._valid_file(base, name, rel + name, entry)
                 except Exception:
-                    dirs.remove(name)
-                    value = self.on_error(base, name)
-                    if value is not None:  # pragma: no cover
+                    valid = False
+                    value = self._hook(self.on_error, base, name, entry)
+                    if value is not None:
+                        yield (root, value) if self._multi_root else value
+
+                if valid:
+                    if matched is not None:
+                        matched.append(name)
+                    value = self._hook(self.on_match, base, name, entry)
+                    yield (root, value) if self._multi_root else value
+                else:
+                    self._skipped += 1
+                    value = self._hook(self.on_skip, base, name, entry)
+                    if value is not None:
+                        yield (root, value) if self._multi_root else value
+
+                if self.is_aborted():
+                    break
+
+    def _can_continue(self):
+        """Check if we can continue on to the next directory."""
+
+        if self.is_aborted():
+            return False
+
+        if self._budget is not None and not self._budget.spend(0):
+            self._truncated = True
+            return False
+
+        return True
+
+    def _load_checkpoint(self, checkpoint):
+        """Load a checkpoint returning the folders left to crawl, the folder we were in, and the skipped count."""
+
+        try:
+            version, signature, stack, current, skipped, visited, revisits = marshal.loads(checkpoint)
+        except (EOFError, ValueError, TypeError):
+            raise ValueError('Invalid checkpoint')
+        if version != _CHECKPOINT_VERSION or signature != self._state_signature():
+            raise ValueError('Checkpoint is not for this search')
+        return [tuple(item) for item in stack], current, skipped, visited, revisits
+
+    def get_checkpoint(self):
+        """
+        Get a checkpoint of the search, or `None` if the search can't be checkpointed.
+
+        The checkpoint contains the folders left to crawl, the entries already handled in
+        the current folder along with the child folders found to crawl, and, with `follow_once`,
+        the folders already crawled. It can be passed to a new instance via `resume`.
+        """
+
+        if self._stack is None:
+            return None
+        current = None
+        if self._current is not None:
+            base, rel, index, ancestors, done, descend = self._current
+            current = (base, rel, index, ancestors, sorted(done), descend)
+        return marshal.dumps(
+            (
+                _CHECKPOINT_VERSION, self._state_signature(), list(self._stack), current, self._skipped,
+                self._visited, self._revisits
+            )
+        )
+
+    def _save_checkpoint(self):
+        """Write the checkpoint to the checkpoint file, replacing the old one in one step."""
+
+        temp = self.checkpoint_file + (b'.tmp' if isinstance(self.checkpoint_file, bytes) else '.tmp')
+        with open(temp, 'wb') as f:
+            f.write(self.get_checkpoint())
+        os.replace(temp, self.checkpoint_file)
+
+    def _walk_serial(self):
+        """
+        Crawl one directory at a time.
+
+        The folders left to crawl, and the entries handled in the current folder, are tracked so the
+        search can be checkpointed and resumed later. If the search is resumed, we pick up from there.
+        """
+
+        if self._resume is not None:
+            stack, current, self._skipped, visited, self._revisits = self._resume
+            self._resume = None
+            if current is not None:
+                base, rel, index, ancestors, done, descend = current
+                current = (base, rel, index, ancestors, set(done), [tuple(item) for item in descend])
+            if visited is not None:
+                self._visited = visited
+        else:
+            # Directories to crawl: the full path, the path relative to the root directory
+            # (with a trailing slash), the index of the root, and the directories above it.
+            stack = self._root_stack()
+            current = None
+
+        self._stack = stack
+        self._current = None
+        self._dirs_done = 0
+        try:
+            while stack or current is not None:
+                if self._step_budget is not None and not self._step_budget.spend(0):
+                    yield _PAUSE
+
+                if not self._can_continue():
+                    break
+
+                if current is not None:
+                    # Resume the folder we were in when the checkpoint was taken.
+                    base, rel, index, ancestors, done, descend = current
+                    current = None
+                else:
+                    base, rel, index, ancestors = stack.pop()
+                    done = set()
+                    descend = []
+                    if self.follow_links:
+                        key = self._get_dir_id(base)
+                        if self._is_revisit(key, ancestors):
+                            continue
+                        # From here on, these are the ancestors of the child folders.
+                        ancestors = self._add_ancestor(key, ancestors)
+                self._current = (base, rel, index, ancestors, done, descend)
+
+                try:
+                    listing = self._scandir(base)
+                except OSError:
+                    self._current = None
+                    continue
+
+                yield from self._walk_listing(base, rel, index, listing, descend, done=done)
+                if self._truncated or self.is_aborted():
+                    # We may not have finished the folder, so leave it as the current folder.
+                    return
+
+                # Crawl the child folders in order.
+                self._current = None
+                stack.extend(item + (ancestors,) for item in reversed(descend))
+
+                self._dirs_done += 1
+                if self.checkpoint_file is not None and self._dirs_done % self.checkpoint_interval == 0:
+                    self._save_checkpoint()
+        finally:
+            if self.checkpoint_file is not None:
+                if stack or self._current is not None:
+                    self._save_checkpoint()
+                elif os.path.exists(self.checkpoint_file):
+                    # We're done, so there is nothing to resume.
+                    os.remove(self.checkpoint_file)
+
+    def _walk_ordered(self, executor):
+        """
+        Crawl with worker threads scanning directories ahead of us, but in the same order as a serial crawl.
+
+        The directories that are next in line are scanned ahead of time, but only a few per worker,
+        so scanned listings don't pile up.
+        """
+
+        window = self.workers * 2
+        stack = [[base, rel, index, ancestors, None] for base, rel, index, ancestors in self._root_stack()]
+        try:
+            while stack:
+                for item in stack[-window:]:
+                    if item[4] is None:
+                        item[4] = executor.submit(self._scan_worker, item[0])
+
+                if not self._can_continue():
+                    break
+
+                base, rel, index, ancestors, future = stack.pop()
+
+                try:
+                    result = future.result()
+                except OSError:
+                    continue
+                if result is None:  # pragma: no cover
+                    break
+                key, listing = result
+                if self._is_revisit(key, ancestors):
+                    continue
+                ancestors = self._add_ancestor(key, ancestors)
+
+                descend = []
+                yield from self._walk_listing(base, rel, index, listing, descend)
+                if self._truncated:
+                    return
+
+                # Crawl the child folders in order.
+                stack.extend([path, child, index, ancestors, None] for path, child, index in reversed(descend))
+        finally:
+            for item in stack:
+                if item[4] is not None:
+                    item[4].cancel()
+
+    def _walk_unordered(self, executor):
+        """Crawl with worker threads, handling directories as soon as they are scanned."""
+
+        pending = {executor.submit(self._scan_worker, item[0]): item for item in self._root_stack()}
+        try:
+            while pending:
+                done = concurrent.futures.wait(pending, return_when=concurrent.futures.FIRST_COMPLETED)[0]
+                for future in done:
+                    base, rel, index, ancestors = pending.pop(future)
+
+                    if not self._can_continue():
+                        return
+
+                    try:
+                        result = future.result()
+                    except OSError:
+                        continue
+                    if result is None:  # pragma: no cover
+                        return
+                    key, listing = result
+                    if self._is_revisit(key, ancestors):
+                        continue
+                    ancestors = self._add_ancestor(key, ancestors)
+
+                    descend = []
+                    yield from self._walk_listing(base, rel, index, listing, descend)
+                    if self._truncated:
+                        return
+
+                    for item in descend:
+                        pending[executor.submit(self._scan_worker, item[0])] = item + (ancestors,)
+        finally:
+            for future in pending:
+                future.cancel()
+
+    def _walk_unit(self, base, rel, index, ancestors):
+        """
+        Crawl a unit of work in a worker process.
+
+        Returns the results, the number of skipped files and directories already crawled, the number
+        of entries examined, and the directories that were left to crawl once the unit grew too big,
+        which become units of their own.
+
+        When following symlinks, the device and inode of the directories above the unit are given
+        by `ancestors`, so a unit will not follow a symlink back into a directory crawled by another
+        unit, and the directories handed back carry their own.
+        """
+
+        self._skipped = 0
+        self._reset_visited()
+
+        results = []
+        entries = 0
+        stack = [(base, rel, index, ancestors)]
+        while stack and entries < _SHARD_SIZE:
+            base, rel, index, ancestors = stack.pop()
+
+            key = self._get_dir_id(base) if self.follow_links else None
+            if self._is_revisit(key, ancestors):
+                continue
+
+            try:
+                listing = self._scandir(base)
+            except OSError:
+                continue
+            entries += len(listing[0]) + len(listing[1])
+
+            descend = []
+            results.extend(self._walk_listing(base, rel, index, listing, descend))
+            ancestors = self._add_ancestor(key, ancestors)
+            stack.extend(item + (ancestors,) for item in reversed(descend))
+
+        return results, self._skipped, self._revisits, entries, stack
+
+    def _walk_processes(self):
+        """
+        Crawl with worker processes, handling units of work as soon as they are done.
+
+        Each worker gets its own copy of the walker, including the compiled checks, and crawls a
+        subtree until it has examined enough entries. Any directories it didn't get to are handed
+        back and sent out as new units of work. Limits are checked between units of work.
+        """
+
+        walker = copy.copy(self)
+        walker._budget = None
+        payload = pickle.dumps(walker)
+        token = uuid.uuid4().hex
+        budget = self._budget
+
+        executor = concurrent.futures.ProcessPoolExecutor(max_workers=self.processes)
+        pending = {executor.submit(_walk_shard, token, payload, *item) for item in self._root_stack()}
+        try:
+            while pending:
+                done, pending = concurrent.futures.wait(pending, return_when=concurrent.futures.FIRST_COMPLETED)
+                for future in done:
+                    if not self._can_continue():
+                        return
+
+                    results, skipped, revisits, entries, remaining = future.result()
+                    self._skipped += skipped
+                    self._revisits += revisits
+                    for item in remaining:
+                        pending.add(executor.submit(_walk_shard, token, payload, *item))
+
+                    for value in results:
                         yield value
+                        if self.is_aborted():
+                            return
+
+                    if budget is not None and not budget.spend(entries):
+                        self._truncated = True
+                        return
+        finally:
+            for future in pending:
+                future.cancel()
+            executor.shutdown(wait=False)
+
+    def _walk(self):
+        """
+        Start search for valid files.
+
+        Directories are crawled top down, just like `os.walk`, but the path relative to the
+        root directory is built up as we go, and each `DirEntry` is reused for the checks.
+
+        With `workers`, directories are scanned by worker threads, but everything else,
+        including all the hooks, is done on the thread consuming the results. With `processes`,
+        the crawl, checks, and hooks are all done in worker processes.
+        """
+
+        if self._budget is not None:
+            self._budget.start()
 
-                if self.is_aborted():  # pragma: no cover
+        if self.processes:
+            yield from self._walk_processes()
+            return
+
+        if not self.workers:
+            yield from self._walk_serial()
+            return
+
+        executor = concurrent.futures.ThreadPoolExecutor(max_workers=self.workers)
+        try:
+            if self.ordered:
+                yield from self._walk_ordered(executor)
+            else:
+                yield from self._walk_unordered(executor)
+        finally:
+            executor.shutdown(wait=False)
+
+    async def _awalk_ordered(self, loop, executor):
+        """Crawl asynchronously, with directories scanned ahead of us, in the same order as a serial crawl."""
+
+        window = (self.workers or 1) * 2
+        stack = [[base, rel, index, ancestors, None] for base, rel, index, ancestors in self._root_stack()]
+        try:
+            while stack:
+                for item in stack[-window:]:
+                    if item[4] is None:
+                        item[4] = loop.run_in_executor(executor, self._scan_worker, item[0])
+
+                if not self._can_continue():
                     break
 
-            # Search files if they were found
-            if files:
-                # Only search files that are in the include rules
-                for name in files:
+                base, rel, index, ancestors, future = stack.pop()
+
+                try:
+                    result = await future
+                except OSError:
+                    continue
+                if result is None:  # pragma: no cover
+                    break
+                key, listing = result
+                if self._is_revisit(key, ancestors):
+                    continue
+                ancestors = self._add_ancestor(key, ancestors)
+
+                descend = []
+                for value in self._walk_listing(base, rel, index, listing, descend):
+                    yield value
+                if self._truncated:
+                    return
+
+                # Crawl the child folders in order.
+                stack.extend([path, child, index, ancestors, None] for path, child, index in reversed(descend))
+        finally:
+            for item in stack:
+                if item[4] is not None:
+                    item[4].cancel()
+
+    async def _awalk_unordered(self, loop, executor):
+        """Crawl asynchronously, handling directories as soon as they are scanned."""
+
+        pending = {loop.run_in_executor(executor, self._scan_worker, item[0]): item for item in self._root_stack()}
+        try:
+            while pending:
+                done = (await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED))[0]
+                for future in done:
+                    base, rel, index, ancestors = pending.pop(future)
+
+                    if not self._can_continue():
+                        return
+
                     try:
-                        valid = self._valid_file(base, name)
-                    except Exception:
-                        valid = False
-                        value = self.on_error(base, name)
-                        if value is not None:
-                            yield value
-
-                    if valid:
-                        yield self.on_match(base, name)
-                    else:
-                        self._skipped += 1
-                        value = self.on_skip(base, name)
-                        if value is not None:
-                            yield value
-
-                    if self.is_aborted():
-                        break
+                        result = future.result()
+                    except OSError:
+                        continue
+                    if result is None:  # pragma: no cover
+                        return
+                    key, listing = result
+                    if self._is_revisit(key, ancestors):
+                        continue
+                    ancestors = self._add_ancestor(key, ancestors)
+
+                    descend = []
+                    for value in self._walk_listing(base, rel, index, listing, descend):
+                        yield value
+                    if self._truncated:
+                        return
+
+                    for item in descend:
+                        pending[loop.run_in_executor(executor, self._scan_worker, item[0])] = item + (ancestors,)
+        finally:
+            for future in pending:
+                future.cancel()
+
+    async def _awalk(self):
+        """
+        Start an asynchronous search for valid files.
+
+        Directories are scanned by worker threads so the event loop is not blocked by the file system,
+        but everything else, including all the hooks, is done on the event loop.
+        """
+
+        if self._budget is not None:
+            self._budget.start()
+
+        loop = asyncio.get_event_loop()
+        executor = concurrent.futures.ThreadPoolExecutor(max_workers=self.workers or 1)
+        try:
+            walk = self._awalk_ordered(loop, executor) if self.ordered else self._awalk_unordered(loop, executor)
+            try:
+                async for value in walk:
+                    yield value
+            finally:
+                await walk.aclose()
+        finally:
+            executor.shutdown(wait=False)
+
+    def _state_signature(self):
+        """Get a signature of the options that decide what matches, so state from other options isn't used."""
+
+        return repr(
+            (
+                self._root_dirs, self.pattern_file, self.pattern_folder_exclude, self.flags, self.follow_once,
+                self.min_size, self.max_size, self.modified_after
+            )
+        )
+
+    def _load_state(self, state_file):
+        """Load the directory state saved by a previous `rescan`, or an empty state if there is none we can use."""
+
+        try:
+            with open(state_file, 'rb') as f:
+                version, signature, dirs = marshal.load(f)
+        except (OSError, EOFError, ValueError, TypeError):
+            return {}
+        if version != _STATE_VERSION or signature != self._state_signature() or not isinstance(dirs, dict):
+            return {}
+        return dirs
+
+    def _save_state(self, state_file, dirs):
+        """Save the directory state, replacing the old state in one step so it is never left half written."""
+
+        temp = state_file + (b'.tmp' if isinstance(state_file, bytes) else '.tmp')
+        with open(temp, 'wb') as f:
+            marshal.dump((_STATE_VERSION, self._state_signature(), dirs), f)
+        os.replace(temp, state_file)
+
+    def _tag_paths(self, index, paths):
+        """Tag paths with their root if there are multiple roots."""
+
+        return ((self._roots[index], path) for path in paths) if self._multi_root else paths
+
+    def rescan(self, state_file):
+        """
+        Search for changes since the last search with the same state file.
+
+        Returns a tuple of the files that now match and the files that no longer match. For each directory,
+        its inode, modification time, matches, and the folders to crawl are saved to the state file, and
+        on the next search, directories that haven't changed are not scanned again. If the search is aborted,
+        the state is not saved.
+
+        As changes to a file's size or modification time don't change its directory, the size and time
+        filters can't be used.
+        """
+
+        if self._needs_stat:
+            raise ValueError('rescan cannot be used with min_size, max_size, or modified_after')
+
+        self._stepper = None
+        self.on_reset()
+        self._skipped = 0
+        self._reset_visited()
+        self._truncated = False
+        self._budget = None
+
+        old = self._load_state(os.fspath(state_file))
+        dirs = {}
+        added = []
+        removed = []
+
+        # Directories are saved by the index of their root and their path relative to it.
+        stack = self._root_stack()
+        while stack:
+            if self.is_aborted():
+                return added, removed
+
+            base, rel, index, ancestors = stack.pop()
+
+            try:
+                st = os.stat(base)
+            except OSError:
+                continue
+            key = (st.st_dev, st.st_ino)
+            if self._is_revisit(key, ancestors):
+                continue
+            ancestors = self._add_ancestor(key, ancestors)
+
+            prev = old.pop((index, rel), None)
+            if prev is not None and prev[0] == st.st_ino and prev[1] == st.st_mtime_ns:
+                # Nothing was added, removed, or renamed, so the previous results still stand.
+                record = prev
+                self._skipped += record[4]
+            else:
+                now = int(time.time() * 1e9)
+                try:
+                    listing = self._scandir(base)
+                except OSError:
+                    continue
+
+                descend = []
+                matched = []
+                skipped = self._skipped
+                for _ in self._walk_listing(base, rel, index, listing, descend, matched):
+                    pass
+
+                # Directories changed too close to when we scanned them are always scanned again.
+                record = (
+                    st.st_ino,
+                    st.st_mtime_ns if now - st.st_mtime_ns >= _wcmatch._RACY_NS else None,
+                    [child[len(rel):-len(self._sep)] for path, child, _ in descend],
+                    matched,
+                    self._skipped - skipped
+                )
+
+                before = set(prev[3]) if prev is not None else set()
+                after = set(matched)
+                added.extend(
+                    self._tag_paths(index, (os.path.join(base, name) for name in matched if name not in before))
+                )
+                if prev is not None:
+                    removed.extend(
+                        self._tag_paths(index, (os.path.join(base, name) for name in prev[3] if name not in after))
+                    )
+
+            dirs[(index, rel)] = record
+            stack.extend(
+                (os.path.join(base, name), rel + name + self._sep, index, ancestors) for name in reversed(record[2])
+            )
+
+        # Directories we didn't get to anymore were removed or excluded, and so were their matches.
+        for (index, rel), record in old.items():
+            base = self._root_dirs[index] + rel
+            removed.extend(self._tag_paths(index, (os.path.join(base, name) for name in record[3])))
+
+        if not self.is_aborted():
+            self._save_state(os.fspath(state_file), dirs)
+        return added, removed
 
     def match(self):
         """Run the directory walker."""
 
         return list(self.imatch())
 
+    def step(self, max_entries=None, max_seconds=None):
+        """
+        Advance the search by a bounded amount of work, returning a `StepResult`.
+
+        Each step examines at most `max_entries` directory entries and stops once `max_seconds` have
+        passed. The search is paused, not stopped, so no work is repeated, and the next step picks up
+        where the last step left off. Once a step reports it is finished, the next step starts a new search.
+        """
+
+        if self.workers is not None or self.processes is not None:
+            raise ValueError('step cannot be used with workers or processes')
+        if max_entries is not None and max_entries < 1:
+            raise ValueError('max_entries must be greater than 0')
+
+        if self._stepper is None:
+            self.on_reset()
+            self._skipped = 0
+            self._reset_visited()
+            self._truncated = False
+            self._budget = self._new_budget()
+            if self._budget is not None:
+                self._budget.start()
+            self._stepper = self._walk_serial()
+
+        self._step_budget = _wcmatch.ScanBudget(max_seconds, max_entries)
+        self._step_budget.start()
+        results = []
+        finished = True
+        try:
+            for value in self._stepper:
+                if value is _PAUSE:
+                    finished = False
+                    break
+                results.append(value)
+        finally:
+            self._step_budget = None
+            if finished:
+                self._stepper = None
+
+        queued = len(self._stack) + (self._current is not None) if not finished else 0
+        return StepResult(results, self._dirs_done, queued, self._skipped, finished)
+
     def imatch(self):
         """Run the directory walker as iterator."""
 
+        self._stepper = None
         self.on_reset()
         self._skipped = 0
+        self._reset_visited()
+        self._truncated = False
+        self._budget = self._new_budget()
         for f in self._walk():
             yield f
+
+    async def aimatch(self):
+        """Run the directory walker as an asynchronous iterator."""
+
+        self._stepper = None
+        self.on_reset()
+        self._skipped = 0
+        self._reset_visited()
+        self._truncated = False
+        self._budget = self._new_budget()
+        async for f in self._awalk():
+            yield f